@@ -1,15 +1,33 @@
 """Core utilities for the context engineering framework."""
 
-from .logger import Logger
-from .config_manager import ConfigManager
-from .validator import Validator
-from .file_handler import FileHandler
-from .token_counter import TokenCounter
+import importlib
+
+# Submodules are imported on first attribute access (PEP 562) so that
+# importing the package doesn't pull in tiktoken, PyYAML, etc. up front.
+_EXPORTS = {
+    'Logger': '.logger',
+    'ConfigManager': '.config_manager',
+    'Validator': '.validator',
+    'FileHandler': '.file_handler',
+    'TokenCounter': '.token_counter',
+}
 
 __all__ = [
     'Logger',
-    'ConfigManager', 
+    'ConfigManager',
     'Validator',
     'FileHandler',
     'TokenCounter'
 ]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,11 +1,14 @@
 """Configuration management for the context engineering framework."""
 
-import json
-import yaml
+import atexit
+import threading
+import weakref
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
-from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Tuple, Union
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
 from .logger import Logger
+from .file_handler import _yaml_support, _encode_json, _load_parsed, _atomic_write
 
 
 @dataclass
@@ -48,14 +51,45 @@ class FrameworkConfig:
     custom: Dict[str, Any] = field(default_factory=dict)
 
 
+def _section_spec(name: str, cls) -> Tuple[str, type, Tuple[str, ...], frozenset, attrgetter]:
+    """Precompute (name, class, field order, field set, getter) for a config section."""
+    keys = tuple(f.name for f in fields(cls))
+    return name, cls, keys, frozenset(keys), attrgetter(*keys)
+
+
+# Metadata table driving FrameworkConfig <-> dict conversion
+_SECTIONS = (
+    _section_spec('model', ModelConfig),
+    _section_spec('agent', AgentConfig),
+    _section_spec('system', SystemConfig),
+)
+
+
+# Managers with a debounced save still pending; the pending Timer keeps each
+# one alive until it fires or is flushed, so a WeakSet is enough here
+_pending_managers: 'weakref.WeakSet[ConfigManager]' = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_pending_managers():
+    """Write every pending debounced save before the interpreter exits."""
+    for manager in list(_pending_managers):
+        manager.flush()
+
+
 class ConfigManager:
     """Manages configuration for the context engineering framework."""
     
-    def __init__(self, config_path: Optional[Union[str, Path]] = None):
+    def __init__(self, config_path: Optional[Union[str, Path]] = None, save_delay: float = 0.25):
         self.config_path = Path(config_path) if config_path else Path("config.yaml")
         self.logger = Logger("ConfigManager")
         self.config = FrameworkConfig()
         
+        # update_config saves are debounced by save_delay seconds (0 saves immediately)
+        self.save_delay = save_delay
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.Lock()
+        
         if self.config_path.exists():
             self.load_config()
         else:
@@ -67,11 +101,8 @@ class ConfigManager:
             self.config_path = Path(config_path)
         
         try:
-            with open(self.config_path, 'r') as f:
-                if self.config_path.suffix.lower() == '.json':
-                    data = json.load(f)
-                else:
-                    data = yaml.safe_load(f)
+            fmt = 'json' if self.config_path.suffix.lower() == '.json' else 'yaml'
+            data = _load_parsed(self.config_path, fmt)
             
             # Update config from loaded data
             self.config = self._dict_to_config(data)
@@ -94,11 +125,14 @@ class ConfigManager:
         try:
             data = self._config_to_dict(self.config)
             
-            with open(self.config_path, 'w') as f:
-                if self.config_path.suffix.lower() == '.json':
-                    json.dump(data, f, indent=2)
-                else:
-                    yaml.dump(data, f, default_flow_style=False, indent=2)
+            if self.config_path.suffix.lower() == '.json':
+                payload = _encode_json(data)
+                _atomic_write(self.config_path, 'wb', lambda f: f.write(payload))
+            else:
+                yaml, _, dumper = _yaml_support()
+                _atomic_write(self.config_path, 'w', lambda f: yaml.dump(
+                    data, f, Dumper=dumper, default_flow_style=False, indent=2
+                ))
             
             self.logger.info(f"Configuration saved to {self.config_path}")
             
@@ -107,66 +141,20 @@ class ConfigManager:
     
     def _config_to_dict(self, config: FrameworkConfig) -> Dict[str, Any]:
         """Convert config dataclass to dictionary."""
-        return {
-            'model': {
-                'name': config.model.name,
-                'max_tokens': config.model.max_tokens,
-                'temperature': config.model.temperature,
-                'top_p': config.model.top_p,
-                'api_key': config.model.api_key,
-                'base_url': config.model.base_url
-            },
-            'agent': {
-                'max_context_length': config.agent.max_context_length,
-                'memory_enabled': config.agent.memory_enabled,
-                'logging_enabled': config.agent.logging_enabled,
-                'auto_save': config.agent.auto_save,
-                'save_interval': config.agent.save_interval
-            },
-            'system': {
-                'debug_mode': config.system.debug_mode,
-                'log_level': config.system.log_level,
-                'data_dir': config.system.data_dir,
-                'temp_dir': config.system.temp_dir,
-                'max_concurrent_agents': config.system.max_concurrent_agents
-            },
-            'custom': config.custom
-        }
+        data = {name: dict(zip(keys, getter(getattr(config, name))))
+                for name, _, keys, _, getter in _SECTIONS}
+        data['custom'] = config.custom
+        return data
     
     def _dict_to_config(self, data: Dict[str, Any]) -> FrameworkConfig:
         """Convert dictionary to config dataclass."""
         config = FrameworkConfig()
         
-        if 'model' in data:
-            model_data = data['model']
-            config.model = ModelConfig(
-                name=model_data.get('name', config.model.name),
-                max_tokens=model_data.get('max_tokens', config.model.max_tokens),
-                temperature=model_data.get('temperature', config.model.temperature),
-                top_p=model_data.get('top_p', config.model.top_p),
-                api_key=model_data.get('api_key'),
-                base_url=model_data.get('base_url')
-            )
-        
-        if 'agent' in data:
-            agent_data = data['agent']
-            config.agent = AgentConfig(
-                max_context_length=agent_data.get('max_context_length', config.agent.max_context_length),
-                memory_enabled=agent_data.get('memory_enabled', config.agent.memory_enabled),
-                logging_enabled=agent_data.get('logging_enabled', config.agent.logging_enabled),
-                auto_save=agent_data.get('auto_save', config.agent.auto_save),
-                save_interval=agent_data.get('save_interval', config.agent.save_interval)
-            )
-        
-        if 'system' in data:
-            system_data = data['system']
-            config.system = SystemConfig(
-                debug_mode=system_data.get('debug_mode', config.system.debug_mode),
-                log_level=system_data.get('log_level', config.system.log_level),
-                data_dir=system_data.get('data_dir', config.system.data_dir),
-                temp_dir=system_data.get('temp_dir', config.system.temp_dir),
-                max_concurrent_agents=system_data.get('max_concurrent_agents', config.system.max_concurrent_agents)
-            )
+        # Unknown keys are ignored and missing ones keep their defaults
+        for name, cls, _, field_names, _ in _SECTIONS:
+            if name in data:
+                section = data[name]
+                setattr(config, name, cls(**{k: v for k, v in section.items() if k in field_names}))
         
         config.custom = data.get('custom', {})
         
@@ -188,7 +176,33 @@ class ConfigManager:
                     setattr(self.config, key, value)
         
         self.logger.info(f"Configuration updated: {updates}")
-        self.save_config()
+        self._schedule_save()
+    
+    def _schedule_save(self):
+        """Coalesce bursts of updates into a single save after save_delay."""
+        if self.save_delay <= 0:
+            self.save_config()
+            return
+        
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+            _pending_managers.add(self)
+    
+    def flush(self):
+        """Write any pending debounced save immediately."""
+        with self._save_lock:
+            pending = self._save_timer is not None
+            if pending:
+                self._save_timer.cancel()
+                self._save_timer = None
+            _pending_managers.discard(self)
+        
+        if pending:
+            self.save_config()
     
     def get_model_config(self) -> ModelConfig:
         """Get model configuration."""
@@ -1,16 +1,168 @@
 """File handling utilities for the context engineering framework."""
 
+import copy
+import dataclasses
 import json
-import yaml
-import pickle
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, IO, List, Optional, Union
 from datetime import datetime
 import shutil
+import stat
+import struct
 import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from .logger import Logger
 from .validator import Validator
 
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+# SIMD-friendly digest by default; MD5 stays available via ``algo='md5'``
+DEFAULT_HASH_ALGO = 'blake3' if _blake3 is not None else 'sha256'
+
+# Header of out-of-band pickle files: magic, buffer count, buffer sizes, buffers, pickle
+_OOB_PICKLE_MAGIC = b'CEPKL5\x00\x01'
+
+# Below this many files, cleanup_temp_files deletes inline rather than spinning up threads
+_PARALLEL_DELETE_THRESHOLD = 64
+
+
+@lru_cache(maxsize=None)
+def _yaml_support():
+    """Import PyYAML on first use, preferring the libyaml-backed loader/dumper."""
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+    return yaml, loader, dumper
+
+
+@lru_cache(maxsize=None)
+def _get_orjson():
+    """Import orjson on first use; None means use the stdlib json module."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def _json_default(obj: Any) -> Any:
+    """Stdlib json fallback mirroring orjson: dataclasses as public-field maps, else str."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)
+                if not f.name.startswith('_')}
+    return str(obj)
+
+
+def _parse_json_file(path: Union[str, Path]) -> Any:
+    """Parse a JSON file, with orjson when available."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    
+    orjson = _get_orjson()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _encode_json(data: Any) -> bytes:
+    """Indented UTF-8 JSON for data, via orjson unless it rejects the input."""
+    orjson = _get_orjson()
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str,
+                                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass  # e.g. ints wider than 64 bits, which the json module accepts
+    return json.dumps(data, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
+@lru_cache(maxsize=256)
+def _parse_yaml_file(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML file. Memoized on the file's stat signature."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    
+    yaml, loader, _ = _yaml_support()
+    return yaml.load(raw, Loader=loader)
+
+
+def _atomic_write(file_path: Path, mode: str, writer: Callable[[IO], Any],
+                  encoding: Optional[str] = None):
+    """Write via a temp file in the same directory, fsync, then os.replace.
+    
+    Readers never observe a partially written file, and the previous inode is
+    left untouched, so hardlinked backups of it stay intact.
+    """
+    file_path = Path(file_path)
+    while True:
+        tmp_name = file_path.parent / f".{file_path.name}.{os.urandom(6).hex()}.tmp"
+        try:
+            # 0o666 lets the kernel apply the umask, as a plain open() would
+            fd = os.open(tmp_name, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        with open(fd, mode, encoding=encoding) as tmp:
+            writer(tmp)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        try:
+            os.chmod(tmp_name, stat.S_IMODE(os.stat(file_path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_name, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _load_parsed(file_path: Path, fmt: str) -> Any:
+    """Load a parsed JSON or YAML file; callers get a private copy.
+    
+    JSON is re-parsed on every call, which beats deep-copying a cached
+    result. YAML parsing is roughly 10x slower than a deepcopy, so parsed
+    YAML is cached and copied out.
+    """
+    if fmt == 'json':
+        return _parse_json_file(file_path)
+    
+    st = file_path.stat()
+    parsed = _parse_yaml_file(os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+    return copy.deepcopy(parsed)
+
+
+def _walk_files(root: Union[str, Path]):
+    """Yield os.DirEntry objects for every file under root.
+    
+    Uses os.scandir so file type and stat data come from the directory read
+    where the OS provides them; symlinked directories are not followed.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
+
+def _unlink_quietly(path: str) -> Optional[OSError]:
+    """Unlink path, returning the error instead of raising it."""
+    try:
+        os.unlink(path)
+    except OSError as e:
+        return e
+    return None
+
 
 class FileHandler:
     """Handles file operations for the framework."""
@@ -37,15 +189,15 @@ class FileHandler:
             file_path = Path(file_path)
             self.validator.validate_file_path(file_path)
             
-            # Create backup if file exists
+            # Create backup if file exists (writes replace the inode, so link it)
             if create_backup and file_path.exists():
-                self._create_backup(file_path)
+                self._create_backup(file_path, link=True)
             
             # Ensure directory exists
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            payload = _encode_json(data)
+            _atomic_write(file_path, 'wb', lambda f: f.write(payload))
             
             self.logger.info(f"JSON data saved to {file_path}")
             return True
@@ -60,8 +212,7 @@ class FileHandler:
             file_path = Path(file_path)
             self.validator.validate_file_path(file_path, must_exist=True)
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _load_parsed(file_path, 'json')
             
             self.logger.debug(f"JSON data loaded from {file_path}")
             return data
@@ -76,15 +227,17 @@ class FileHandler:
             file_path = Path(file_path)
             self.validator.validate_file_path(file_path)
             
-            # Create backup if file exists
+            # Create backup if file exists (writes replace the inode, so link it)
             if create_backup and file_path.exists():
-                self._create_backup(file_path)
+                self._create_backup(file_path, link=True)
             
             # Ensure directory exists
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                yaml.dump(data, f, default_flow_style=False, indent=2, allow_unicode=True)
+            yaml, _, dumper = _yaml_support()
+            _atomic_write(file_path, 'w', lambda f: yaml.dump(
+                data, f, Dumper=dumper, default_flow_style=False, indent=2, allow_unicode=True
+            ), encoding='utf-8')
             
             self.logger.info(f"YAML data saved to {file_path}")
             return True
@@ -99,8 +252,7 @@ class FileHandler:
             file_path = Path(file_path)
             self.validator.validate_file_path(file_path, must_exist=True)
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+            data = _load_parsed(file_path, 'yaml')
             
             self.logger.debug(f"YAML data loaded from {file_path}")
             return data
@@ -115,15 +267,14 @@ class FileHandler:
             file_path = Path(file_path)
             self.validator.validate_file_path(file_path)
             
-            # Create backup if file exists
+            # Create backup if file exists (writes replace the inode, so link it)
             if create_backup and file_path.exists():
-                self._create_backup(file_path)
+                self._create_backup(file_path, link=True)
             
             # Ensure directory exists
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(text)
+            _atomic_write(file_path, 'w', lambda f: f.write(text), encoding='utf-8')
             
             self.logger.debug(f"Text saved to {file_path}")
             return True
@@ -148,21 +299,43 @@ class FileHandler:
             self.logger.error(f"Failed to load text from {file_path}: {e}")
             return None
     
-    def save_pickle(self, data: Any, file_path: Union[str, Path], create_backup: bool = True) -> bool:
-        """Save data as pickle file."""
+    def save_pickle(self, data: Any, file_path: Union[str, Path], create_backup: bool = True,
+                    out_of_band: bool = False) -> bool:
+        """Save data as pickle file (protocol 5).
+        
+        With ``out_of_band=True`` large buffers (bytearray, contiguous numpy
+        arrays, ...) are written straight from memory after a small header
+        instead of being copied into the pickle stream. Such files can only be
+        read back with ``load_pickle``.
+        """
         try:
             file_path = Path(file_path)
             self.validator.validate_file_path(file_path)
             
-            # Create backup if file exists
+            # Create backup if file exists (writes replace the inode, so link it)
             if create_backup and file_path.exists():
-                self._create_backup(file_path)
+                self._create_backup(file_path, link=True)
             
             # Ensure directory exists
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(file_path, 'wb') as f:
-                pickle.dump(data, f)
+            import pickle
+            if out_of_band:
+                buffers = []
+                payload = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+                raw_buffers = [buffer.raw() for buffer in buffers]
+                
+                def write_out_of_band(f):
+                    f.write(_OOB_PICKLE_MAGIC)
+                    f.write(struct.pack(f'<Q{len(raw_buffers)}Q', len(raw_buffers),
+                                        *(raw.nbytes for raw in raw_buffers)))
+                    for raw in raw_buffers:
+                        f.write(raw)
+                    f.write(payload)
+                
+                _atomic_write(file_path, 'wb', write_out_of_band)
+            else:
+                _atomic_write(file_path, 'wb', lambda f: pickle.dump(data, f, protocol=5))
             
             self.logger.debug(f"Pickle data saved to {file_path}")
             return True
@@ -172,13 +345,25 @@ class FileHandler:
             return False
     
     def load_pickle(self, file_path: Union[str, Path]) -> Optional[Any]:
-        """Load data from pickle file."""
+        """Load data from pickle file (plain or out-of-band)."""
         try:
             file_path = Path(file_path)
             self.validator.validate_file_path(file_path, must_exist=True)
             
+            import pickle
             with open(file_path, 'rb') as f:
-                data = pickle.load(f)
+                if f.read(len(_OOB_PICKLE_MAGIC)) == _OOB_PICKLE_MAGIC:
+                    (count,) = struct.unpack('<Q', f.read(8))
+                    sizes = struct.unpack(f'<{count}Q', f.read(8 * count))
+                    buffers = []
+                    for size in sizes:
+                        buffer = bytearray(size)
+                        f.readinto(buffer)
+                        buffers.append(buffer)
+                    data = pickle.load(f, buffers=buffers)
+                else:
+                    f.seek(0)
+                    data = pickle.load(f)
             
             self.logger.debug(f"Pickle data loaded from {file_path}")
             return data
@@ -187,31 +372,122 @@ class FileHandler:
             self.logger.error(f"Failed to load pickle from {file_path}: {e}")
             return None
     
-    def _create_backup(self, file_path: Path):
-        """Create backup of existing file."""
+    def save_msgpack(self, data: Any, file_path: Union[str, Path], create_backup: bool = True) -> bool:
+        """Save data as MessagePack via msgspec (dataclasses such as FrameworkConfig are supported)."""
+        try:
+            file_path = Path(file_path)
+            self.validator.validate_file_path(file_path)
+            
+            # Create backup if file exists (writes replace the inode, so link it)
+            if create_backup and file_path.exists():
+                self._create_backup(file_path, link=True)
+            
+            # Ensure directory exists
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            import msgspec
+            payload = msgspec.msgpack.encode(data)
+            _atomic_write(file_path, 'wb', lambda f: f.write(payload))
+            
+            self.logger.debug(f"MessagePack data saved to {file_path}")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to save MessagePack to {file_path}: {e}")
+            return False
+    
+    def load_msgpack(self, file_path: Union[str, Path], type: Optional[Any] = None) -> Optional[Any]:
+        """Load MessagePack data, optionally decoding straight into ``type``."""
+        try:
+            file_path = Path(file_path)
+            self.validator.validate_file_path(file_path, must_exist=True)
+            
+            import msgspec
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            data = msgspec.msgpack.decode(raw, type=type) if type is not None else msgspec.msgpack.decode(raw)
+            
+            self.logger.debug(f"MessagePack data loaded from {file_path}")
+            return data
+            
+        except Exception as e:
+            self.logger.error(f"Failed to load MessagePack from {file_path}: {e}")
+            return None
+    
+    def _create_backup(self, file_path: Path, link: bool = False):
+        """Create backup of existing file.
+        
+        With ``link=True`` the backup is a hardlink, which is only safe when the
+        original inode will not be modified in place afterwards (it is about to
+        be replaced by ``_atomic_write`` or deleted). Otherwise the data is
+        copied in-kernel, which becomes a reflink on copy-on-write filesystems.
+        """
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_name = f"{file_path.stem}_{timestamp}{file_path.suffix}"
             backup_path = self.backup_dir / backup_name
             
-            shutil.copy2(file_path, backup_path)
+            if backup_path.exists():
+                backup_path.unlink()
+            
+            if link:
+                try:
+                    os.link(file_path, backup_path)
+                    self.logger.debug(f"Backup created: {backup_path}")
+                    return
+                except OSError:
+                    pass  # cross-device or unsupported; fall back to a copy
+            
+            self._copy_file(file_path, backup_path)
             self.logger.debug(f"Backup created: {backup_path}")
             
         except Exception as e:
             self.logger.warning(f"Failed to create backup for {file_path}: {e}")
     
-    def get_file_hash(self, file_path: Union[str, Path]) -> Optional[str]:
-        """Get MD5 hash of file."""
+    def _copy_file(self, src: Path, dst: Path):
+        """Copy file contents and metadata, preferring os.copy_file_range."""
+        if hasattr(os, 'copy_file_range'):
+            try:
+                with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                    remaining = os.fstat(fsrc.fileno()).st_size
+                    while remaining > 0:
+                        copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                shutil.copystat(src, dst)
+                return
+            except OSError:
+                pass  # e.g. EXDEV/ENOSYS on older kernels
+        
+        shutil.copy2(src, dst)
+    
+    def get_file_hash(self, file_path: Union[str, Path], algo: Optional[str] = None) -> Optional[str]:
+        """Get hash of file.
+        
+        Defaults to BLAKE3 when installed, otherwise SHA-256. Pass ``algo='md5'``
+        (or any hashlib algorithm name) for legacy digests.
+        """
         try:
             file_path = Path(file_path)
             self.validator.validate_file_path(file_path, must_exist=True)
             
-            hash_md5 = hashlib.md5()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
+            algo = algo or DEFAULT_HASH_ALGO
+            if algo == 'blake3' and _blake3 is not None:
+                new_hash = _blake3
+            else:
+                new_hash = partial(hashlib.new, algo)
             
-            return hash_md5.hexdigest()
+            with open(file_path, 'rb') as f:
+                if hasattr(hashlib, 'file_digest'):
+                    return hashlib.file_digest(f, new_hash).hexdigest()
+                
+                # Python < 3.11: hash the whole mapped file in one call
+                digest = new_hash()
+                if os.fstat(f.fileno()).st_size > 0:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        digest.update(mm)
+                return digest.hexdigest()
             
         except Exception as e:
             self.logger.error(f"Failed to get hash for {file_path}: {e}")
@@ -230,9 +506,10 @@ class FileHandler:
                 self.logger.warning(f"File does not exist: {file_path}")
                 return True
             
-            # Create backup before deletion
+            # Create backup before deletion; the original is unlinked right after,
+            # so a hardlink preserves its contents without copying
             if create_backup:
-                self._create_backup(file_path)
+                self._create_backup(file_path, link=True)
             
             file_path.unlink()
             self.logger.info(f"File deleted: {file_path}")
@@ -242,22 +519,29 @@ class FileHandler:
             self.logger.error(f"Failed to delete file {file_path}: {e}")
             return False
     
-    def cleanup_temp_files(self, max_age_hours: int = 24):
+    def cleanup_temp_files(self, max_age_hours: int = 24, max_workers: int = 32):
         """Clean up temporary files older than specified hours."""
         try:
             import time
             current_time = time.time()
             max_age_seconds = max_age_hours * 3600
             
-            deleted_count = 0
-            for file_path in self.temp_dir.rglob('*'):
-                if file_path.is_file():
-                    file_age = current_time - file_path.stat().st_mtime
-                    if file_age > max_age_seconds:
-                        file_path.unlink()
-                        deleted_count += 1
+            expired = [entry.path for entry in _walk_files(self.temp_dir)
+                       if current_time - entry.stat().st_mtime > max_age_seconds]
+            
+            # Overlap unlink latency across threads when there is enough to delete
+            if len(expired) >= _PARALLEL_DELETE_THRESHOLD and max_workers > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    errors = list(executor.map(_unlink_quietly, expired))
+            else:
+                errors = [_unlink_quietly(path) for path in expired]
+            
+            failures = [error for error in errors if error is not None]
+            deleted_count = len(expired) - len(failures)
             
             self.logger.info(f"Cleaned up {deleted_count} temporary files")
+            if failures:
+                self.logger.warning(f"Failed to delete {len(failures)} temporary files: {failures[0]}")
             
         except Exception as e:
             self.logger.error(f"Failed to cleanup temp files: {e}")
@@ -265,13 +549,9 @@ class FileHandler:
     def get_directory_size(self, directory: Union[str, Path]) -> int:
         """Get total size of directory in bytes."""
         directory = Path(directory)
-        total_size = 0
         
         try:
-            for file_path in directory.rglob('*'):
-                if file_path.is_file():
-                    total_size += file_path.stat().st_size
-            return total_size
+            return sum(entry.stat().st_size for entry in _walk_files(directory))
             
         except Exception as e:
             self.logger.error(f"Failed to get directory size for {directory}: {e}")
@@ -1,10 +1,173 @@
 """Enhanced logging system for context engineering framework."""
 
+import atexit
 import logging
 import json
-from datetime import datetime
+import os
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, IO, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+
+_LEVEL_MAP = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+    'critical': logging.CRITICAL,
+}
+
+# (epoch second, formatted 'YYYY-MM-DDTHH:MM:SS') of the last timestamp built
+_last_second = (-1, '')
+
+
+def _utc_timestamp() -> str:
+    """ISO-8601 UTC timestamp with microseconds; the date/time prefix is reused within a second."""
+    global _last_second
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    cached_second, prefix = _last_second
+    if seconds != cached_second:
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds))
+        _last_second = (seconds, prefix)
+    return f"{prefix}.{nanos // 1000:06d}"
+
+
+# Structured records from every Logger are handed to a single daemon thread
+# that writes them in batches, keeping file I/O off the calling thread.
+_MAX_BATCH = 512
+_write_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+_writer_lock = threading.Lock()
+_writer_thread: Optional[threading.Thread] = None
+# Set at exit once the writer is told to stop; later records are written inline
+_writer_stopped = False
+
+
+def _write_batch(stream: IO, records: list):
+    """Write records to stream in one call."""
+    try:
+        stream.write(b''.join(records))
+        stream.flush()
+    except (OSError, ValueError):
+        pass  # stream closed or unwritable; drop the batch
+
+
+def _drain_structured_records():
+    """Writer loop: group queued records per stream and write each group at once."""
+    stopping = False
+    while not stopping:
+        item = _write_queue.get()
+        if item is None:
+            break
+        
+        batches: Dict[Any, list] = {item[0]: [item[1]]}
+        for _ in range(_MAX_BATCH - 1):
+            try:
+                item = _write_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stopping = True
+                break
+            batches.setdefault(item[0], []).append(item[1])
+        
+        for stream, records in batches.items():
+            _write_batch(stream, records)
+
+
+def _ensure_writer():
+    """Start the shared writer thread on first use."""
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread is None and not _writer_stopped:
+            _writer_thread = threading.Thread(
+                target=_drain_structured_records, name="structured-log-writer", daemon=True
+            )
+            _writer_thread.start()
+
+
+def _enqueue_record(stream: IO, record: bytes):
+    """Hand a record to the writer thread, or write it directly once that has stopped."""
+    if _writer_stopped:
+        _write_batch(stream, [record])
+    else:
+        _write_queue.put((stream, record))
+
+
+def _flush_structured_records(timeout: float = 5.0):
+    """Stop the writer thread after it has written everything queued so far."""
+    global _writer_stopped
+    with _writer_lock:
+        _writer_stopped = True
+    _write_queue.put(None)
+    if _writer_thread is not None:
+        _writer_thread.join(timeout)
+    # Records queued while the writer was stopping
+    while True:
+        try:
+            item = _write_queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is not None:
+            _write_batch(item[0], [item[1]])
+
+
+# Registered at import, ahead of the exit hooks of modules that log through
+# this one, so it runs after them (atexit is LIFO) and their records are kept
+atexit.register(_flush_structured_records)
+
+
+class _FileHandleRegistry:
+    """Process-wide cache of open log files and the handlers writing to them.
+    
+    Every component creates its own Logger, often several with the same name;
+    sharing one handle and one handler per path keeps fd count and handler
+    locks constant.
+    """
+    
+    _lock = threading.Lock()
+    _streams: Dict[Tuple[str, str], IO] = {}
+    _handlers: Dict[str, logging.Handler] = {}
+    
+    @classmethod
+    def get(cls, path: Path, mode: str = 'a') -> IO:
+        """Return the shared stream for path: line-buffered text, or 64 KiB-buffered binary."""
+        key = (os.path.abspath(path), mode)
+        with cls._lock:
+            stream = cls._streams.get(key)
+            if stream is None or stream.closed:
+                if 'b' in mode:
+                    stream = open(path, mode, buffering=1 << 16)
+                else:
+                    stream = open(path, mode, buffering=1, encoding='utf-8')
+                cls._streams[key] = stream
+            return stream
+    
+    @classmethod
+    def handler(cls, path: Path, level: int, formatter: logging.Formatter) -> logging.Handler:
+        """Return the shared logging handler writing to path."""
+        key = os.path.abspath(path)
+        with cls._lock:
+            handler = cls._handlers.get(key)
+        if handler is None:
+            stream = cls.get(path, 'a')
+            with cls._lock:
+                handler = cls._handlers.get(key)
+                if handler is None:
+                    handler = logging.StreamHandler(stream)
+                    handler.setLevel(level)
+                    handler.setFormatter(formatter)
+                    cls._handlers[key] = handler
+        return handler
+
+
+_console_handler: Optional[logging.Handler] = None
 
 
 class Logger:
@@ -26,8 +189,9 @@ class Logger:
         self._setup_formatters()
         self._setup_handlers()
         
-        # Context tracking
+        # Context tracking; _merged_stack[i] is the merge of context_stack[:i + 1]
         self.context_stack = []
+        self._merged_stack = []
         
     def _setup_formatters(self):
         """Setup log formatters."""
@@ -41,69 +205,70 @@ class Logger:
     
     def _setup_handlers(self):
         """Setup log handlers."""
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(self.console_formatter)
-        self.logger.addHandler(console_handler)
+        global _console_handler
         
-        # File handler
+        # Console handler (one for the whole process)
+        if _console_handler is None:
+            _console_handler = logging.StreamHandler()
+            _console_handler.setLevel(logging.INFO)
+            _console_handler.setFormatter(self.console_formatter)
+        self.logger.addHandler(_console_handler)
+        
+        # File handler, shared by every Logger writing to the same file
         log_file = self.log_dir / f"{self.name}.log"
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(self.file_formatter)
-        self.logger.addHandler(file_handler)
+        self.logger.addHandler(
+            _FileHandleRegistry.handler(log_file, logging.DEBUG, self.file_formatter)
+        )
         
-        # JSON handler for structured logs
+        # Structured logs are serialized once and written straight to the file,
+        # bypassing the logging handler/formatter stack
         json_file = self.log_dir / f"{self.name}_structured.json"
-        json_handler = logging.FileHandler(json_file)
-        json_handler.setLevel(logging.DEBUG)
-        json_handler.setFormatter(logging.Formatter('%(message)s'))
-        self.json_handler = json_handler
-        self.logger.addHandler(json_handler)
+        self.json_level = logging.DEBUG
+        self._json_stream = _FileHandleRegistry.get(json_file, 'ab')
+        _ensure_writer()
     
     def push_context(self, context: Dict[str, Any]):
         """Push context onto the context stack."""
         self.context_stack.append(context)
-        self.debug(f"Context pushed: {context}")
+        merged = self._merged_stack[-1] if self._merged_stack else {}
+        self._merged_stack.append({**merged, **context})
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.debug(f"Context pushed: {context}")
     
     def pop_context(self) -> Optional[Dict[str, Any]]:
         """Pop context from the context stack."""
         if self.context_stack:
             context = self.context_stack.pop()
-            self.debug(f"Context popped: {context}")
+            self._merged_stack.pop()
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.debug(f"Context popped: {context}")
             return context
         return None
     
     def get_current_context(self) -> Dict[str, Any]:
         """Get the current context."""
-        merged_context = {}
-        for context in self.context_stack:
-            merged_context.update(context)
-        return merged_context
+        return dict(self._merged_stack[-1]) if self._merged_stack else {}
     
     def _log_structured(self, level: str, message: str, **kwargs):
         """Log structured data."""
+        level_num = _LEVEL_MAP[level]
+        if level_num < self.json_level or not self.logger.isEnabledFor(level_num):
+            return
+        
         log_entry = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': _utc_timestamp(),
             'level': level,
             'message': message,
-            'context': self.get_current_context(),
+            'context': self._merged_stack[-1] if self._merged_stack else {},
             **kwargs
         }
         
-        # Log to JSON handler
-        self.json_handler.emit(
-            logging.LogRecord(
-                name=self.name,
-                level=getattr(logging, level.upper()),
-                pathname='',
-                lineno=0,
-                msg=json.dumps(log_entry),
-                args=(),
-                exc_info=None
-            )
-        )
+        if orjson is not None:
+            record = orjson.dumps(log_entry, default=str)
+        else:
+            record = json.dumps(log_entry, default=str).encode('utf-8')
+        
+        _enqueue_record(self._json_stream, record + b'\n')
     
     def debug(self, message: str, **kwargs):
         """Debug level logging."""
@@ -2,7 +2,7 @@
 
 import re
 import tiktoken
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from .logger import Logger
 
 
@@ -61,6 +61,56 @@ class TokenCounter:
         # Fallback: rough estimation (4 characters per token)
         return max(1, len(text) // 4)
     
+    def encode(self, text: str) -> Optional[List[int]]:
+        """Token ids for text, or None when no tokenizer is available."""
+        if not text:
+            return []
+        
+        if self.tokenizer:
+            try:
+                return self.tokenizer.encode(text)
+            except Exception as e:
+                self.logger.error(f"Tokenizer error: {e}")
+        
+        return None
+    
+    def decode(self, tokens: List[int]) -> str:
+        """Text for token ids produced by encode()."""
+        return self.tokenizer.decode(list(tokens)) if self.tokenizer else ""
+    
+    def decode_prefix(self, tokens: List[int], count: int) -> str:
+        """Text for the first count token ids, backing off up to 3 tokens so no UTF-8 character is split."""
+        if not self.tokenizer:
+            return ""
+        for cut in range(count, max(count - 4, 0), -1):
+            try:
+                return self.tokenizer.decode_bytes(tokens[:cut]).decode('utf-8')
+            except UnicodeDecodeError:
+                continue
+        return self.tokenizer.decode_bytes(tokens[:max(count - 3, 0)]).decode('utf-8', errors='ignore')
+    
+    def encode_batch(self, texts: List[str], num_threads: int = 8) -> List[Optional[List[int]]]:
+        """Token ids for many texts via the tokenizer's threaded batch encoder (None entries without one)."""
+        encoded: List[Optional[List[int]]] = [[] if not text else None for text in texts]
+        pending = [i for i, text in enumerate(texts) if text]
+        if not pending or not self.tokenizer:
+            return encoded
+        
+        try:
+            batch = self.tokenizer.encode_batch([texts[i] for i in pending],
+                                                num_threads=num_threads)
+            for i, tokens in zip(pending, batch):
+                encoded[i] = tokens
+        except Exception as e:
+            self.logger.error(f"Tokenizer error: {e}")
+        
+        return encoded
+    
+    def count_tokens_batch(self, texts: List[str], num_threads: int = 8) -> List[int]:
+        """Count tokens for many texts at once, using the tokenizer's threaded batch encoder."""
+        return [len(tokens) if tokens is not None else max(1, len(text) // 4)
+                for text, tokens in zip(texts, self.encode_batch(texts, num_threads))]
+    
     def estimate_tokens_rough(self, text: str) -> int:
         """Rough token estimation without tokenizer."""
         if not text:
@@ -134,6 +184,36 @@ class TokenCounter:
         self.logger.info(f"Text truncated from {current_tokens} to {self.count_tokens(truncated_text)} tokens")
         return truncated_text
     
+    def truncate_to_tokens(self, text: str, max_tokens: int) -> Tuple[str, int]:
+        """Longest prefix of text within max_tokens, and its token count."""
+        tokens = self.encode(text)
+        if tokens is not None:
+            # Tokenize once and cut at the token boundary
+            if len(tokens) <= max_tokens:
+                return text, len(tokens)
+            # Re-count the cut: a decoded prefix can tokenize differently
+            keep = max_tokens
+            while True:
+                truncated = self.decode_prefix(tokens, keep)
+                truncated_tokens = self.count_tokens(truncated)
+                if truncated_tokens <= max_tokens or keep <= 0:
+                    return truncated, truncated_tokens
+                keep -= truncated_tokens - max_tokens
+        
+        # No tokenizer: binary search the character cut, stopping within 32 chars
+        token_count = self.count_tokens(text)
+        if token_count <= max_tokens:
+            return text, token_count
+        low, high = 0, len(text)  # text[:low] fits, text[:high] doesn't
+        while high - low > 32:
+            mid = (low + high) // 2
+            if self.count_tokens(text[:mid]) <= max_tokens:
+                low = mid
+            else:
+                high = mid
+        truncated = text[:low]
+        return truncated, self.count_tokens(truncated)
+    
     def _truncate_at_boundary(self, text: str) -> str:
         """Truncate text at natural boundaries."""
         # Try to end at sentence boundary
@@ -234,7 +314,7 @@ class TokenCounter:
     
     def get_token_usage_summary(self, texts: List[str]) -> Dict[str, Any]:
         """Get summary of token usage for multiple texts."""
-        token_counts = [self.count_tokens(text) for text in texts]
+        token_counts = self.count_tokens_batch(texts)
         
         return {
             "total_texts": len(texts),
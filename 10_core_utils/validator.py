@@ -6,6 +6,22 @@ from typing import Any, Dict, List, Optional, Union, Callable
 from pathlib import Path
 from .logger import Logger
 
+_DANGEROUS_PATTERNS = (
+    r'<script',
+    r'javascript:',
+    r'data:text/html',
+    r'eval\(',
+    r'exec\(',
+    r'__import__',
+    r'subprocess',
+    r'os\.system',
+)
+
+# One compiled alternation scans the text once instead of once per pattern;
+# each pattern is its own group so a match reports which one fired
+_DANGEROUS_RE = re.compile('|'.join(f'({pattern})' for pattern in _DANGEROUS_PATTERNS),
+                           re.IGNORECASE)
+
 
 class ValidationError(Exception):
     """Custom validation error."""
@@ -169,20 +185,10 @@ class Validator:
     
     def is_safe_string(self, text: str) -> bool:
         """Check if string is safe (no injection attempts)."""
-        dangerous_patterns = [
-            r'<script',
-            r'javascript:',
-            r'data:text/html',
-            r'eval\(',
-            r'exec\(',
-            r'__import__',
-            r'subprocess',
-            r'os\.system',
-        ]
-        
-        for pattern in dangerous_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                self.logger.warning(f"Potentially dangerous pattern detected: {pattern}")
-                return False
+        match = _DANGEROUS_RE.search(text)
+        if match:
+            pattern = _DANGEROUS_PATTERNS[match.lastindex - 1]
+            self.logger.warning(f"Potentially dangerous pattern detected: {pattern}")
+            return False
         
         return True
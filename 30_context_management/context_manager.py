@@ -1,37 +1,115 @@
 """Core context management for the framework."""
 
 import json
-from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime, timedelta
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Set, Tuple, FrozenSet
+from datetime import datetime
 from dataclasses import dataclass, field
+from functools import wraps
+from itertools import chain
+from operator import attrgetter, itemgetter
+import bisect
+import heapq
+import threading
+import time
 import uuid
 
 from ..10_core_utils import Logger, FileHandler, TokenCounter, Validator
 
+_SEARCH_CACHE_SIZE = 64
+_WINDOW_CACHE_SIZE = 8
 
-@dataclass
+# Auto-optimization lets the total overshoot max_tokens up to the high
+# watermark, then evicts down to the low one, so steady inserts don't
+# trigger an eviction pass each time they cross the limit
+_HIGH_WATERMARK = 1.05
+_LOW_WATERMARK = 0.9
+
+SearchKey = Tuple[str, Optional[str], FrozenSet[str]]
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Distinct 3-character substrings of text (empty for shorter strings)."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _to_epoch(value) -> Optional[float]:
+    """Normalize a datetime, ISO string or number to epoch seconds."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+
+def _token_array(token_ids: Optional[List[int]]) -> Optional[array]:
+    """Pack token ids into a compact int array (None passes through)."""
+    return array('i', token_ids) if token_ids is not None else None
+
+
+def _synchronized(method):
+    """Run a ContextManager method while holding the manager's lock."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+_TIMESTAMP_BITS = 60
+_TIMESTAMP_MASK = (1 << _TIMESTAMP_BITS) - 1
+
+
+def _pack_sort_key(priority: int, timestamp: float) -> int:
+    """Pack (priority, timestamp) into one int that orders the same way.
+    
+    The timestamp is truncated to microseconds in the low 60 bits; priority
+    sits above them, so any integer priority keeps lexicographic ordering.
+    """
+    return (int(priority) << _TIMESTAMP_BITS) | (int(timestamp * 1_000_000) & _TIMESTAMP_MASK)
+
+
+def _insort_unique(entries: List[tuple], entry: tuple):
+    """Insert entry into a sorted list unless an equal entry is already there."""
+    index = bisect.bisect_left(entries, entry)
+    if index == len(entries) or entries[index] != entry:
+        entries.insert(index, entry)
+
+
+@dataclass(slots=True, eq=False)
 class ContextItem:
     """Represents a single context item."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
     content: str = ""
     type: str = "general"  # general, system, user, assistant, memory, tool_result
     priority: int = 1  # 1-10, higher is more important
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: float = field(default_factory=time.time)  # epoch seconds
     metadata: Dict[str, Any] = field(default_factory=dict)
     token_count: int = 0
     relevance_score: float = 1.0
-    expiry: Optional[datetime] = None
+    expiry: Optional[float] = None  # epoch seconds
     tags: List[str] = field(default_factory=list)
+    # Lowercased content for search; derived, never serialized
+    _content_lower: str = field(default="", init=False, repr=False, compare=False)
+    # Token ids of content from ingestion, if a tokenizer was available; never serialized
+    _tokens: Optional[array] = field(default=None, init=False, repr=False, compare=False)
+    # (priority, timestamp) packed into one int for ranking; refreshed by ContextManager
+    _sort_key: int = field(default=0, init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        if isinstance(self.timestamp, str):
-            self.timestamp = datetime.fromisoformat(self.timestamp)
-        if isinstance(self.expiry, str) and self.expiry:
-            self.expiry = datetime.fromisoformat(self.expiry)
+        self._content_lower = self.content.lower()
+        if not isinstance(self.timestamp, float):
+            self.timestamp = _to_epoch(self.timestamp)
+        if self.expiry is not None and not isinstance(self.expiry, float):
+            self.expiry = _to_epoch(self.expiry)
+        self._sort_key = _pack_sort_key(self.priority, self.timestamp)
     
     def is_expired(self) -> bool:
         """Check if context item has expired."""
-        return self.expiry is not None and datetime.now() > self.expiry
+        return self.expiry is not None and time.time() > self.expiry
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -40,11 +118,11 @@ class ContextItem:
             'content': self.content,
             'type': self.type,
             'priority': self.priority,
-            'timestamp': self.timestamp.isoformat(),
+            'timestamp': datetime.fromtimestamp(self.timestamp).isoformat(),
             'metadata': self.metadata,
             'token_count': self.token_count,
             'relevance_score': self.relevance_score,
-            'expiry': self.expiry.isoformat() if self.expiry else None,
+            'expiry': datetime.fromtimestamp(self.expiry).isoformat() if self.expiry is not None else None,
             'tags': self.tags
         }
     
@@ -65,27 +143,53 @@ class ContextManager:
         self.token_counter = TokenCounter()
         self.validator = Validator()
         
+        # Guards the storage, indexes and caches below. Every mutation touches
+        # shared structures (dict, heap, sorted lists, trigram postings), so
+        # per-ID lock striping would not protect them; single-item lookups
+        # stay lock-free since they are atomic dict reads under the GIL
+        self._lock = threading.RLock()
+        
         # Context storage
         self.contexts: Dict[str, ContextItem] = {}
-        self.context_order: List[str] = []  # For ordering by insertion/priority
+        self.context_order: Dict[str, None] = {}  # Insertion-ordered set of IDs
         
         # Context categories
-        self.system_contexts: List[str] = []
-        self.conversation_contexts: List[str] = []
-        self.memory_contexts: List[str] = []
-        self.tool_contexts: List[str] = []
-        
-        # Statistics
-        self.stats = {
-            'total_items': 0,
-            'total_tokens': 0,
-            'items_by_type': {},
-            'last_optimization': None
-        }
+        self.system_contexts: Set[str] = set()
+        self.conversation_contexts: Set[str] = set()
+        self.memory_contexts: Set[str] = set()
+        self.tool_contexts: Set[str] = set()
+        
+        # Running aggregates, kept in sync by every mutation
+        self._total_tokens = 0
+        self._type_counts: Dict[str, int] = {}
+        
+        # Lowercased content trigram -> IDs of contexts containing it
+        self._trigram_index: Dict[str, Set[str]] = {}
+        
+        # LRU of (query, type, tags) -> matching IDs in result order;
+        # cleared whenever a context is added, updated or removed
+        self._search_cache: 'OrderedDict[SearchKey, List[str]]' = OrderedDict()
+        
+        # max_tokens -> (window text, epoch time it stays valid until); cleared
+        # with the search cache, and an entry lapses when a context expires
+        self._window_cache: Dict[int, Tuple[str, float]] = {}
+        
+        # Min-heap of (sort key, id); entries for removed/updated
+        # items are left in place and skipped when popped
+        self._eviction_heap: List[Tuple[int, str]] = []
+        
+        # Sorted (timestamp, id) and (sort key, id) lists backing the
+        # recency/priority queries; stale entries are skipped like heap entries
+        self._by_time: List[Tuple[float, str]] = []
+        self._by_priority: List[Tuple[int, str]] = []
+        
+        # Statistics (the rest of get_stats() comes from the running aggregates)
+        self._last_optimization = None
         
         # Load existing context if available
         self._load_context()
     
+    @_synchronized
     def add_context(self, content: str, context_type: str = "general", 
                    priority: int = 1, metadata: Optional[Dict[str, Any]] = None,
                    tags: Optional[List[str]] = None, expiry: Optional[datetime] = None) -> str:
@@ -94,8 +198,10 @@ class ContextManager:
             # Validate content
             self.validator.is_safe_string(content)
             
-            # Count tokens
-            token_count = self.token_counter.count_tokens(content)
+            # Tokenize once; the ids are kept for get_context_window_tokens
+            token_ids = self.token_counter.encode(content)
+            token_count = (len(token_ids) if token_ids is not None
+                           else self.token_counter.count_tokens(content))
             
             # Create context item
             context_item = ContextItem(
@@ -107,21 +213,20 @@ class ContextManager:
                 tags=tags or [],
                 expiry=expiry
             )
+            context_item._tokens = _token_array(token_ids)
             
             # Add to storage
             self.contexts[context_item.id] = context_item
-            self.context_order.append(context_item.id)
+            self.context_order[context_item.id] = None
+            self._track_added(context_item)
             
             # Add to appropriate category
             self._categorize_context(context_item)
             
-            # Update statistics
-            self._update_stats()
-            
             self.logger.debug(f"Added context item: {context_item.id} ({token_count} tokens)")
             
             # Auto-optimize if needed
-            if self.get_total_tokens() > self.max_tokens:
+            if self._over_high_watermark():
                 self.optimize_context()
             
             return context_item.id
@@ -130,26 +235,71 @@ class ContextManager:
             self.logger.error(f"Failed to add context: {e}")
             return ""
     
+    @_synchronized
+    def add_contexts(self, items: List[Dict[str, Any]]) -> List[str]:
+        """Add many context items, counting their tokens in one batch.
+        
+        Each item takes the same keys as add_context's arguments.
+        """
+        try:
+            for item in items:
+                self.validator.is_safe_string(item.get('content', ''))
+            
+            contents = [item.get('content', '') for item in items]
+            encoded = self.token_counter.encode_batch(contents)
+            token_counts = [len(token_ids) if token_ids is not None
+                            else self.token_counter.count_tokens(content)
+                            for content, token_ids in zip(contents, encoded)]
+            
+            context_ids = []
+            for item, token_ids, token_count in zip(items, encoded, token_counts):
+                context_item = ContextItem(
+                    content=item.get('content', ''),
+                    type=item.get('context_type', 'general'),
+                    priority=item.get('priority', 1),
+                    metadata=item.get('metadata') or {},
+                    token_count=token_count,
+                    tags=item.get('tags') or [],
+                    expiry=item.get('expiry')
+                )
+                context_item._tokens = _token_array(token_ids)
+                
+                self.contexts[context_item.id] = context_item
+                self.context_order[context_item.id] = None
+                self._track_added(context_item)
+                self._categorize_context(context_item)
+                context_ids.append(context_item.id)
+            
+            self.logger.debug(f"Added {len(context_ids)} context items ({sum(token_counts)} tokens)")
+            
+            # Auto-optimize once for the whole batch
+            if self._over_high_watermark():
+                self.optimize_context()
+            
+            return context_ids
+            
+        except Exception as e:
+            self.logger.error(f"Failed to add contexts: {e}")
+            return []
+    
     def get_context(self, context_id: str) -> Optional[ContextItem]:
         """Get context item by ID."""
         return self.contexts.get(context_id)
     
+    @_synchronized
     def remove_context(self, context_id: str) -> bool:
         """Remove context item."""
         try:
             if context_id in self.contexts:
                 # Remove from storage
-                del self.contexts[context_id]
+                self._track_removed(self.contexts.pop(context_id))
                 
                 # Remove from order
-                if context_id in self.context_order:
-                    self.context_order.remove(context_id)
+                self.context_order.pop(context_id, None)
                 
                 # Remove from categories
                 self._remove_from_categories(context_id)
-                
-                # Update statistics
-                self._update_stats()
+                self._compact_ordered_indexes()
                 
                 self.logger.debug(f"Removed context item: {context_id}")
                 return True
@@ -160,6 +310,7 @@ class ContextManager:
             self.logger.error(f"Failed to remove context {context_id}: {e}")
             return False
     
+    @_synchronized
     def update_context(self, context_id: str, **updates) -> bool:
         """Update context item."""
         try:
@@ -167,6 +318,7 @@ class ContextManager:
                 return False
             
             context_item = self.contexts[context_id]
+            self._track_removed(context_item)
             
             # Update fields
             for key, value in updates.items():
@@ -175,13 +327,18 @@ class ContextManager:
             
             # Recalculate token count if content changed
             if 'content' in updates:
-                context_item.token_count = self.token_counter.count_tokens(context_item.content)
+                context_item._content_lower = context_item.content.lower()
+                token_ids = self.token_counter.encode(context_item.content)
+                context_item._tokens = _token_array(token_ids)
+                context_item.token_count = (len(token_ids) if token_ids is not None
+                                            else self.token_counter.count_tokens(context_item.content))
             
-            # Update timestamp
-            context_item.timestamp = datetime.now()
+            if 'expiry' in updates:
+                context_item.expiry = _to_epoch(context_item.expiry)
             
-            # Update statistics
-            self._update_stats()
+            # Update timestamp
+            context_item.timestamp = time.time()
+            self._track_added(context_item)
             
             self.logger.debug(f"Updated context item: {context_id}")
             return True
@@ -190,33 +347,59 @@ class ContextManager:
             self.logger.error(f"Failed to update context {context_id}: {e}")
             return False
     
+    @_synchronized
     def get_contexts_by_type(self, context_type: str) -> List[ContextItem]:
         """Get all contexts of specific type."""
         return [ctx for ctx in self.contexts.values() if ctx.type == context_type]
     
+    @_synchronized
     def get_contexts_by_priority(self, min_priority: int = 1) -> List[ContextItem]:
         """Get contexts above minimum priority."""
-        contexts = [ctx for ctx in self.contexts.values() if ctx.priority >= min_priority]
-        return sorted(contexts, key=lambda x: (x.priority, x.timestamp), reverse=True)
+        start = bisect.bisect_left(self._by_priority, int(min_priority) << _TIMESTAMP_BITS,
+                                   key=itemgetter(0))
+        return [self.contexts[entry[1]] for entry in reversed(self._by_priority[start:])
+                if self._is_live_entry(*entry)]
     
+    @_synchronized
     def get_recent_contexts(self, hours: int = 24, limit: Optional[int] = None) -> List[ContextItem]:
         """Get recent contexts within time window."""
-        cutoff = datetime.now() - timedelta(hours=hours)
-        contexts = [ctx for ctx in self.contexts.values() if ctx.timestamp > cutoff]
-        contexts.sort(key=lambda x: x.timestamp, reverse=True)
+        cutoff = time.time() - hours * 3600
+        start = bisect.bisect_right(self._by_time, cutoff, key=itemgetter(0))
         
-        if limit:
-            contexts = contexts[:limit]
+        contexts = []
+        for index in range(len(self._by_time) - 1, start - 1, -1):
+            timestamp, context_id = self._by_time[index]
+            context = self.contexts.get(context_id)
+            if context is None or context.timestamp != timestamp:
+                continue
+            contexts.append(context)
+            if limit and len(contexts) >= limit:
+                break
         
         return contexts
     
+    @_synchronized
     def search_contexts(self, query: str, context_type: Optional[str] = None,
                        tags: Optional[List[str]] = None) -> List[ContextItem]:
         """Search contexts by content, type, or tags."""
         results = []
         query_lower = query.lower()
+        cache_key = (query_lower, context_type or None, frozenset(tags or ()))
         
-        for context in self.contexts.values():
+        cached_ids = self._search_cache.get(cache_key)
+        if cached_ids is not None:
+            self._search_cache.move_to_end(cache_key)
+            return [self.contexts[ctx_id] for ctx_id in cached_ids
+                    if not self.contexts[ctx_id].is_expired()]
+        
+        # Matches for a substring of the query are a superset of ours
+        superset_ids = self._cached_superset(cache_key)
+        if superset_ids is not None:
+            candidates = [self.contexts[ctx_id] for ctx_id in superset_ids]
+        else:
+            candidates = self._search_candidates(query_lower)
+        
+        for context in candidates:
             # Skip expired contexts
             if context.is_expired():
                 continue
@@ -230,136 +413,324 @@ class ContextManager:
                 continue
             
             # Search in content
-            if query_lower in context.content.lower():
+            if query_lower in context._content_lower:
                 results.append(context)
         
         # Sort by relevance (could be improved with better scoring)
-        results.sort(key=lambda x: (x.priority, x.timestamp), reverse=True)
+        results.sort(key=attrgetter('_sort_key'), reverse=True)
+        
+        self._search_cache[cache_key] = [ctx.id for ctx in results]
+        if len(self._search_cache) > _SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
         
         return results
     
+    def _cached_superset(self, cache_key: SearchKey) -> Optional[List[str]]:
+        """Smallest cached result whose query is a substring of this one, with the same filters."""
+        query_lower, context_type, tags = cache_key
+        best = None
+        for (cached_query, cached_type, cached_tags), ctx_ids in self._search_cache.items():
+            if (cached_type == context_type and cached_tags == tags
+                    and cached_query in query_lower
+                    and (best is None or len(ctx_ids) < len(best))):
+                best = ctx_ids
+        return best
+    
+    def _search_candidates(self, query_lower: str):
+        """Contexts that can contain query_lower, narrowed through the trigram index."""
+        query_trigrams = _trigrams(query_lower)
+        if not query_trigrams:
+            return self.contexts.values()  # too short to use the index
+        
+        postings = []
+        for trigram in query_trigrams:
+            posting = self._trigram_index.get(trigram)
+            if not posting:
+                return ()
+            postings.append(posting)
+        
+        postings.sort(key=len)
+        candidate_ids = set(postings[0])
+        for posting in postings[1:]:
+            candidate_ids &= posting
+            if not candidate_ids:
+                return ()
+        
+        return [self.contexts[ctx_id] for ctx_id in candidate_ids]
+    
+    @_synchronized
     def optimize_context(self, target_tokens: Optional[int] = None):
         """Optimize context to fit within token limits."""
-        target_tokens = target_tokens or int(self.max_tokens * 0.9)
-        current_tokens = self.get_total_tokens()
+        target_tokens = target_tokens or int(self.max_tokens * _LOW_WATERMARK)
+        current_tokens = self._total_tokens
         
         if current_tokens <= target_tokens:
             return
         
         self.logger.info(f"Optimizing context: {current_tokens} -> {target_tokens} tokens")
         
-        # Remove expired contexts first
-        self._remove_expired_contexts()
+        # Expired contexts are always evicted
+        expired_ids = {ctx_id for ctx_id, ctx in self.contexts.items() if ctx.is_expired()}
+        remaining_tokens = current_tokens - sum(self.contexts[ctx_id].token_count for ctx_id in expired_ids)
         
-        # Get contexts sorted by importance (priority + recency)
-        contexts = list(self.contexts.values())
-        contexts.sort(key=lambda x: (x.priority, x.timestamp.timestamp()), reverse=True)
-        
-        # Keep most important contexts
-        total_tokens = 0
-        contexts_to_keep = []
-        
-        for context in contexts:
-            if total_tokens + context.token_count <= target_tokens:
-                contexts_to_keep.append(context.id)
-                total_tokens += context.token_count
-            else:
-                break
+        # Then pop the least important (lowest priority, oldest) until the rest fits
+        contexts_to_remove = set(expired_ids)
+        while remaining_tokens > target_tokens and self._eviction_heap:
+            sort_key, context_id = heapq.heappop(self._eviction_heap)
+            if context_id in contexts_to_remove or not self._is_live_entry(sort_key, context_id):
+                continue
+            contexts_to_remove.add(context_id)
+            remaining_tokens -= self.contexts[context_id].token_count
         
-        # Remove contexts not in keep list
-        contexts_to_remove = set(self.contexts.keys()) - set(contexts_to_keep)
-        for context_id in contexts_to_remove:
-            self.remove_context(context_id)
+        # Remove evicted and expired contexts in a single pass
+        self._remove_contexts_batch(contexts_to_remove)
         
-        self.stats['last_optimization'] = datetime.now()
+        if expired_ids:
+            self.logger.info(f"Removed {len(expired_ids)} expired contexts")
+        self._last_optimization = datetime.now()
         self.logger.info(f"Context optimized: {len(contexts_to_remove)} items removed")
     
+    @_synchronized
     def get_context_window(self, max_tokens: Optional[int] = None) -> str:
         """Get formatted context window for model input."""
         max_tokens = max_tokens or self.max_tokens
         
-        # Get active contexts sorted by priority and recency
-        contexts = [ctx for ctx in self.contexts.values() if not ctx.is_expired()]
-        contexts.sort(key=lambda x: (x.priority, x.timestamp.timestamp()), reverse=True)
+        now = time.time()
+        cached = self._window_cache.get(max_tokens)
+        if cached is not None and now <= cached[1]:
+            return cached[0]
         
-        # Build context window
-        context_parts = []
-        current_tokens = 0
+        contexts, valid_until = self._select_window_contexts(max_tokens, now)
+        
+        window = "\n\n".join(self._format_context_item(context) for context in contexts)
+        if len(self._window_cache) >= _WINDOW_CACHE_SIZE:
+            self._window_cache.pop(next(iter(self._window_cache)))
+        self._window_cache[max_tokens] = (window, valid_until)
+        return window
+    
+    @_synchronized
+    def get_context_window_tokens(self, max_tokens: Optional[int] = None) -> List[int]:
+        """Get the context window as token ids, reusing each item's ingestion-time tokens.
+        
+        Only the short headers and separators are tokenized here. Returns an
+        empty list when no tokenizer is available.
+        """
+        max_tokens = max_tokens or self.max_tokens
+        contexts, _ = self._select_window_contexts(max_tokens, time.time())
+        
+        separator = self.token_counter.encode("\n\n")
+        if separator is None:
+            self.logger.warning("No tokenizer available for window tokens")
+            return []
         
+        pieces = []
         for context in contexts:
+            if context._tokens is None:  # loaded from disk; tokenize on first use
+                context._tokens = _token_array(self.token_counter.encode(context.content))
+            if pieces:
+                pieces.append(separator)
+            pieces.append(self.token_counter.encode(self._format_context_header(context) + "\n") or ())
+            pieces.append(context._tokens or ())
+        
+        return list(chain.from_iterable(pieces))
+    
+    def _select_window_contexts(self, max_tokens: int, now: float) -> Tuple[List[ContextItem], float]:
+        """Pick the contexts for a window and the epoch time the pick stays valid until."""
+        # Walk active contexts by priority and recency straight off the sorted
+        # index; only the items up to the first one that doesn't fit are touched
+        selected = []
+        current_tokens = 0
+        valid_until = float('inf')  # until one of the examined items expires
+        
+        for entry in reversed(self._by_priority):
+            if not self._is_live_entry(*entry):
+                continue
+            context = self.contexts[entry[1]]
+            if context.expiry is not None:
+                if now > context.expiry:
+                    continue
+                valid_until = min(valid_until, context.expiry)
+            
             if current_tokens + context.token_count <= max_tokens:
-                context_parts.append(self._format_context_item(context))
+                selected.append(context)
                 current_tokens += context.token_count
             else:
                 break
         
-        return "\n\n".join(context_parts)
+        return selected, valid_until
     
     def _format_context_item(self, context: ContextItem) -> str:
         """Format context item for display."""
+        return f"{self._format_context_header(context)}\n{context.content}"
+    
+    def _format_context_header(self, context: ContextItem) -> str:
+        """Format the header line shown above a context item."""
         header = f"[{context.type.upper()}]" + (f" #{context.priority}" if context.priority > 1 else "")
         
         if context.tags:
             header += f" Tags: {', '.join(context.tags)}"
         
-        return f"{header}\n{context.content}"
+        return header
     
     def _categorize_context(self, context: ContextItem):
-        """Categorize context into appropriate list."""
+        """Categorize context into appropriate set."""
         context_id = context.id
         
         if context.type == "system":
-            self.system_contexts.append(context_id)
+            self.system_contexts.add(context_id)
         elif context.type in ["user", "assistant"]:
-            self.conversation_contexts.append(context_id)
+            self.conversation_contexts.add(context_id)
         elif context.type == "memory":
-            self.memory_contexts.append(context_id)
+            self.memory_contexts.add(context_id)
         elif context.type == "tool_result":
-            self.tool_contexts.append(context_id)
+            self.tool_contexts.add(context_id)
     
     def _remove_from_categories(self, context_id: str):
-        """Remove context ID from all category lists."""
-        for category_list in [self.system_contexts, self.conversation_contexts, 
-                             self.memory_contexts, self.tool_contexts]:
-            if context_id in category_list:
-                category_list.remove(context_id)
+        """Remove context ID from all category sets."""
+        for category in (self.system_contexts, self.conversation_contexts,
+                         self.memory_contexts, self.tool_contexts):
+            category.discard(context_id)
     
+    @_synchronized
     def _remove_expired_contexts(self):
         """Remove all expired contexts."""
-        expired_ids = [ctx_id for ctx_id, ctx in self.contexts.items() if ctx.is_expired()]
-        for ctx_id in expired_ids:
-            self.remove_context(ctx_id)
+        expired_ids = {ctx_id for ctx_id, ctx in self.contexts.items() if ctx.is_expired()}
+        self._remove_contexts_batch(expired_ids)
         
         if expired_ids:
             self.logger.info(f"Removed {len(expired_ids)} expired contexts")
     
-    def _update_stats(self):
-        """Update context statistics."""
-        self.stats['total_items'] = len(self.contexts)
-        self.stats['total_tokens'] = sum(ctx.token_count for ctx in self.contexts.values())
+    def _remove_contexts_batch(self, context_ids: Set[str]):
+        """Remove many contexts at once, updating categories and stats a single time."""
+        if not context_ids:
+            return
+        
+        context_ids = set(context_ids)
+        for context_id in context_ids:
+            context = self.contexts.pop(context_id, None)
+            if context is not None:
+                self._track_removed(context)
+            self.context_order.pop(context_id, None)
+        
+        self.system_contexts -= context_ids
+        self.conversation_contexts -= context_ids
+        self.memory_contexts -= context_ids
+        self.tool_contexts -= context_ids
+        self._compact_ordered_indexes()
+        
+        self.logger.debug(f"Removed {len(context_ids)} context items")
+    
+    def _track_added(self, context: ContextItem):
+        """Fold a context into the running token/type aggregates, search index and eviction heap."""
+        self._total_tokens += context.token_count
+        self._type_counts[context.type] = self._type_counts.get(context.type, 0) + 1
+        self._search_cache.clear()
+        self._window_cache.clear()
+        
+        for trigram in _trigrams(context._content_lower):
+            self._trigram_index.setdefault(trigram, set()).add(context.id)
+        
+        context._sort_key = _pack_sort_key(context.priority, context.timestamp)
+        entry = (context._sort_key, context.id)
+        heapq.heappush(self._eviction_heap, entry)
+        _insort_unique(self._by_priority, entry)
+        _insort_unique(self._by_time, (context.timestamp, context.id))
+        self._compact_ordered_indexes()
+    
+    def _track_removed(self, context: ContextItem):
+        """Take a context out of the running aggregates and search index (heap entries go stale)."""
+        self._total_tokens -= context.token_count
+        remaining = self._type_counts.get(context.type, 0) - 1
+        if remaining > 0:
+            self._type_counts[context.type] = remaining
+        else:
+            self._type_counts.pop(context.type, None)
+        self._search_cache.clear()
+        self._window_cache.clear()
         
-        # Count by type
-        type_counts = {}
+        for trigram in _trigrams(context._content_lower):
+            posting = self._trigram_index.get(trigram)
+            if posting is not None:
+                posting.discard(context.id)
+                if not posting:
+                    del self._trigram_index[trigram]
+    
+    def _rebuild_aggregates(self):
+        """Recompute the running aggregates and indexes from scratch (after bulk loads)."""
+        self._total_tokens = 0
+        self._type_counts = {}
+        self._trigram_index = {}
+        self._search_cache.clear()
+        self._window_cache.clear()
         for context in self.contexts.values():
-            type_counts[context.type] = type_counts.get(context.type, 0) + 1
-        self.stats['items_by_type'] = type_counts
+            self._total_tokens += context.token_count
+            self._type_counts[context.type] = self._type_counts.get(context.type, 0) + 1
+            for trigram in _trigrams(context._content_lower):
+                self._trigram_index.setdefault(trigram, set()).add(context.id)
+        self._rebuild_ordered_indexes()
+    
+    def _rebuild_ordered_indexes(self):
+        """Rebuild the eviction heap and sorted lists from live contexts, dropping stale entries."""
+        self._eviction_heap = [(ctx._sort_key, ctx.id) for ctx in self.contexts.values()]
+        self._by_priority = sorted(self._eviction_heap)
+        self._by_time = sorted((ctx.timestamp, ctx.id) for ctx in self.contexts.values())
+        heapq.heapify(self._eviction_heap)
+    
+    def _compact_ordered_indexes(self):
+        """Rebuild the heap and sorted lists once stale entries outnumber live ones."""
+        # Eviction pops shrink the heap but never the sorted lists, so each is checked
+        limit = 2 * len(self.contexts) + 64
+        if (len(self._by_priority) > limit or len(self._by_time) > limit
+                or len(self._eviction_heap) > limit):
+            self._rebuild_ordered_indexes()
+    
+    def _is_live_entry(self, sort_key: int, context_id: str) -> bool:
+        """Check that a heap entry still describes the current state of its context."""
+        context = self.contexts.get(context_id)
+        return context is not None and context._sort_key == sort_key
+    
+    def _check_aggregates(self) -> bool:
+        """Recount the running totals from scratch and repair them if they drifted."""
+        actual_tokens = sum(ctx.token_count for ctx in self.contexts.values())
+        if actual_tokens == self._total_tokens:
+            return True
+        
+        self.logger.warning(f"Token total drifted: tracked {self._total_tokens}, actual {actual_tokens}")
+        self._rebuild_aggregates()
+        return False
+    
+    def _over_high_watermark(self) -> bool:
+        """Check whether the running total is far enough over budget to evict."""
+        return self._total_tokens > self.max_tokens * _HIGH_WATERMARK
     
     def get_total_tokens(self) -> int:
         """Get total token count of all contexts."""
-        return sum(ctx.token_count for ctx in self.contexts.values())
+        return self._total_tokens
     
+    @_synchronized
     def get_stats(self) -> Dict[str, Any]:
         """Get context statistics."""
-        return self.stats.copy()
+        return {
+            'total_items': len(self.contexts),
+            'total_tokens': self._total_tokens,
+            'items_by_type': dict(self._type_counts),
+            'last_optimization': self._last_optimization
+        }
     
+    @_synchronized
     def save_context(self) -> bool:
         """Save context to file."""
         try:
+            # Saving already walks every item, so verify the totals here
+            self._check_aggregates()
+            
             context_data = {
                 'agent_id': self.agent_id,
-                'contexts': {ctx_id: ctx.to_dict() for ctx_id, ctx in self.contexts.items()},
-                'context_order': self.context_order,
-                'stats': self.stats,
+                # Items go to the JSON encoder as dataclasses (epoch-float
+                # timestamps), skipping the per-item to_dict hop
+                'contexts': self.contexts,
+                'context_order': list(self.context_order),
+                'stats': self.get_stats(),
                 'saved_at': datetime.now().isoformat()
             }
             
@@ -386,15 +757,25 @@ class ContextManager:
             for ctx_id, ctx_data in data.get('contexts', {}).items():
                 self.contexts[ctx_id] = ContextItem.from_dict(ctx_data)
             
+            # Count tokens in one batch for items saved without a count
+            uncounted = [ctx for ctx_id, ctx in self.contexts.items()
+                         if 'token_count' not in data['contexts'][ctx_id]]
+            if uncounted:
+                token_counts = self.token_counter.count_tokens_batch(
+                    [ctx.content for ctx in uncounted])
+                for ctx, token_count in zip(uncounted, token_counts):
+                    ctx.token_count = token_count
+            
             # Load order
-            self.context_order = data.get('context_order', [])
+            self.context_order = dict.fromkeys(data.get('context_order', []))
             
             # Load stats
-            self.stats.update(data.get('stats', {}))
+            self._last_optimization = data.get('stats', {}).get('last_optimization')
             
-            # Rebuild categories
+            # Rebuild categories and aggregates
             for context in self.contexts.values():
                 self._categorize_context(context)
+            self._rebuild_aggregates()
             
             self.logger.info(f"Loaded {len(self.contexts)} context items")
             return True
@@ -403,13 +784,13 @@ class ContextManager:
             self.logger.error(f"Failed to load context: {e}")
             return False
     
+    @_synchronized
     def clear_context(self, context_type: Optional[str] = None):
         """Clear contexts, optionally by type."""
         if context_type:
-            contexts_to_remove = [ctx_id for ctx_id, ctx in self.contexts.items() 
-                                if ctx.type == context_type]
-            for ctx_id in contexts_to_remove:
-                self.remove_context(ctx_id)
+            contexts_to_remove = {ctx_id for ctx_id, ctx in self.contexts.items()
+                                  if ctx.type == context_type}
+            self._remove_contexts_batch(contexts_to_remove)
             self.logger.info(f"Cleared {len(contexts_to_remove)} contexts of type {context_type}")
         else:
             self.contexts.clear()
@@ -418,5 +799,5 @@ class ContextManager:
             self.conversation_contexts.clear()
             self.memory_contexts.clear()
             self.tool_contexts.clear()
-            self._update_stats()
+            self._rebuild_aggregates()
             self.logger.info("Cleared all contexts")
@@ -1,14 +1,38 @@
 """Advanced context optimization strategies."""
 
 import re
-from typing import List, Dict, Any, Optional, Tuple, Set
-from datetime import datetime, timedelta
+import time
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Set
 from collections import defaultdict, Counter
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from operator import attrgetter
+
+try:
+    import numpy as _np
+except ImportError:  # scoring falls back to pure Python
+    _np = None
 
 from ..10_core_utils import Logger, TokenCounter
 from .context_manager import ContextItem
 
+_WORD_RE = re.compile(r'\b\w+\b')
+_FILLER_RE = re.compile(r'\b(?:very|really|quite|rather|somewhat|actually|basically)\b',
+                        re.IGNORECASE)
+
+_COMPRESSED_MARKER = "\n[...compressed...]"
+_COMPRESSED_TAG = ['compressed']  # only ever concatenated, never mutated
+
+_TYPE_BONUS = {
+    'system': 1.0,
+    'instructions': 0.9,
+    'conversation': 0.7,
+    'memory': 0.6,
+    'tool_result': 0.5
+}
+
+# Below this many contexts, building the NumPy arrays costs more than it saves
+_NUMPY_MIN_CONTEXTS = 256
+
 
 @dataclass
 class OptimizationMetrics:
@@ -25,6 +49,23 @@ class OptimizationMetrics:
         self.compression_ratio = 1 - (self.tokens_after / self.tokens_before) if self.tokens_before > 0 else 0
 
 
+@dataclass
+class _AnalysisStats:
+    """Single-pass summary of a context list, shared by the report helpers."""
+    total_contexts: int = 0
+    total_tokens: int = 0
+    type_dist: Dict[str, int] = field(default_factory=dict)
+    priority_dist: Dict[int, int] = field(default_factory=dict)
+    tokens_by_type: Dict[str, int] = field(default_factory=dict)
+    age_groups: Dict[str, int] = field(default_factory=lambda: {'recent': 0, 'medium': 0, 'old': 0})
+    max_priority_count: int = 0
+    oldest: float = 0.0
+    newest: float = 0.0
+    total_chars: int = 0
+    whitespace_chars: int = 0
+    compressible_contexts: int = 0
+
+
 class ContextOptimizer:
     """Advanced context optimization with multiple strategies."""
     
@@ -32,6 +73,7 @@ class ContextOptimizer:
         self.max_tokens = max_tokens
         self.logger = Logger("ContextOptimizer")
         self.token_counter = TokenCounter()
+        self._marker_tokens = self.token_counter.count_tokens(_COMPRESSED_MARKER)
         
         # Optimization strategies
         self.strategies = {
@@ -57,7 +99,7 @@ class ContextOptimizer:
                          target_tokens: Optional[int] = None,
                          strategy: str = 'hybrid') -> Tuple[List[ContextItem], OptimizationMetrics]:
         """Optimize contexts using specified strategy."""
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         target_tokens = target_tokens or int(self.max_tokens * 0.9)
         
         tokens_before = sum(ctx.token_count for ctx in contexts)
@@ -75,14 +117,18 @@ class ContextOptimizer:
             )
         
         # Apply optimization strategy
-        if strategy in self.strategies:
+        if (strategy == 'hybrid' and self.config['preserve_system_contexts'] and
+                all(ctx.type == 'system' for ctx in contexts)):
+            # Hybrid keeps every live system context, so skip straight to that
+            optimized_contexts = [ctx for ctx in contexts if not ctx.is_expired()]
+        elif strategy in self.strategies:
             optimized_contexts = self.strategies[strategy](contexts, target_tokens)
         else:
             self.logger.warning(f"Unknown strategy '{strategy}', using hybrid")
             optimized_contexts = self._optimize_hybrid(contexts, target_tokens)
         
         # Calculate metrics
-        optimization_time = (datetime.now() - start_time).total_seconds()
+        optimization_time = time.perf_counter() - start_time
         tokens_after = sum(ctx.token_count for ctx in optimized_contexts)
         items_after = len(optimized_contexts)
         
@@ -106,21 +152,11 @@ class ContextOptimizer:
         # Sort by priority (descending) and timestamp (descending)
         sorted_contexts = sorted(
             contexts,
-            key=lambda x: (x.priority, x.timestamp.timestamp()),
+            key=attrgetter('_sort_key'),
             reverse=True
         )
         
-        selected_contexts = []
-        current_tokens = 0
-        
-        for context in sorted_contexts:
-            if current_tokens + context.token_count <= target_tokens:
-                selected_contexts.append(context)
-                current_tokens += context.token_count
-            else:
-                break
-        
-        return selected_contexts
+        return self._take_within_budget(sorted_contexts, target_tokens)
     
     def _optimize_by_recency(self, contexts: List[ContextItem], 
                             target_tokens: int) -> List[ContextItem]:
@@ -128,21 +164,36 @@ class ContextOptimizer:
         # Sort by timestamp (descending)
         sorted_contexts = sorted(
             contexts,
-            key=lambda x: x.timestamp.timestamp(),
+            key=attrgetter('timestamp'),
             reverse=True
         )
         
-        selected_contexts = []
+        return self._take_within_budget(sorted_contexts, target_tokens)
+    
+    def _take_within_budget(self, sorted_contexts: List[ContextItem],
+                            target_tokens: int) -> List[ContextItem]:
+        """Longest prefix of sorted_contexts whose token counts fit in target_tokens."""
+        cutoff, _ = self._fit_prefix(sorted_contexts, target_tokens)
+        return sorted_contexts[:cutoff]
+    
+    def _fit_prefix(self, sorted_contexts: List[ContextItem],
+                    target_tokens: int) -> Tuple[int, int]:
+        """Length and token total of the longest prefix that fits in target_tokens."""
+        if _np is not None and len(sorted_contexts) >= _NUMPY_MIN_CONTEXTS:
+            tokens = _np.fromiter((ctx.token_count for ctx in sorted_contexts),
+                                  dtype=_np.int64, count=len(sorted_contexts))
+            cumulative = _np.cumsum(tokens)
+            cutoff = int(_np.searchsorted(cumulative, target_tokens, side='right'))
+            return cutoff, int(cumulative[cutoff - 1]) if cutoff else 0
+        
         current_tokens = 0
         
-        for context in sorted_contexts:
-            if current_tokens + context.token_count <= target_tokens:
-                selected_contexts.append(context)
-                current_tokens += context.token_count
-            else:
-                break
+        for cutoff, context in enumerate(sorted_contexts):
+            if current_tokens + context.token_count > target_tokens:
+                return cutoff, current_tokens
+            current_tokens += context.token_count
         
-        return selected_contexts
+        return len(sorted_contexts), current_tokens
     
     def _optimize_by_relevance(self, contexts: List[ContextItem], 
                               target_tokens: int) -> List[ContextItem]:
@@ -153,7 +204,7 @@ class ContextOptimizer:
         # Sort by relevance score (descending)
         sorted_contexts = sorted(
             contexts,
-            key=lambda x: x.relevance_score,
+            key=attrgetter('relevance_score'),
             reverse=True
         )
         
@@ -180,7 +231,7 @@ class ContextOptimizer:
         # Sort by importance (priority + recency)
         sorted_contexts = sorted(
             contexts,
-            key=lambda x: (x.priority, x.timestamp.timestamp()),
+            key=attrgetter('_sort_key'),
             reverse=True
         )
         
@@ -193,8 +244,10 @@ class ContextOptimizer:
                 # Try to compress
                 remaining_tokens = target_tokens - current_tokens
                 if remaining_tokens > 100:  # Minimum useful size
-                    compressed_content = self._compress_content(context.content, remaining_tokens)
-                    if compressed_content:
+                    compressed = self._compress_content(context.content, remaining_tokens,
+                                                        context.token_count, context._tokens)
+                    if compressed:
+                        compressed_content, compressed_tokens = compressed
                         compressed_context = ContextItem(
                             id=context.id,
                             content=compressed_content,
@@ -202,10 +255,10 @@ class ContextOptimizer:
                             priority=context.priority,
                             timestamp=context.timestamp,
                             metadata=context.metadata,
-                            token_count=self.token_counter.count_tokens(compressed_content),
+                            token_count=compressed_tokens,
                             relevance_score=context.relevance_score,
                             expiry=context.expiry,
-                            tags=context.tags + ['compressed']
+                            tags=context.tags + _COMPRESSED_TAG
                         )
                         compressed_contexts.append(compressed_context)
                         current_tokens += compressed_context.token_count
@@ -219,21 +272,13 @@ class ContextOptimizer:
         # Group contexts by semantic similarity
         groups = self._group_contexts_semantically(contexts)
         
-        selected_contexts = []
-        current_tokens = 0
+        # Select best representative from each group; it carries the group's
+        # highest priority, so ordering representatives orders the groups
+        representatives = [max(group, key=attrgetter('priority', 'relevance_score', 'timestamp'))
+                           for group in groups]
+        representatives.sort(key=attrgetter('priority'), reverse=True)
         
-        # Process each group
-        for group in sorted(groups, key=lambda g: max(ctx.priority for ctx in g), reverse=True):
-            # Select best representative from each group
-            best_context = max(group, key=lambda x: (x.priority, x.relevance_score, x.timestamp.timestamp()))
-            
-            if current_tokens + best_context.token_count <= target_tokens:
-                selected_contexts.append(best_context)
-                current_tokens += best_context.token_count
-            else:
-                break
-        
-        return selected_contexts
+        return self._take_within_budget(representatives, target_tokens)
     
     def _optimize_hybrid(self, contexts: List[ContextItem], 
                         target_tokens: int) -> List[ContextItem]:
@@ -242,10 +287,16 @@ class ContextOptimizer:
         active_contexts = self._filter_active_contexts(contexts)
         
         # Step 2: Ensure system contexts are preserved
-        system_contexts = [ctx for ctx in active_contexts if ctx.type == 'system']
-        non_system_contexts = [ctx for ctx in active_contexts if ctx.type != 'system']
+        system_contexts = []
+        non_system_contexts = []
+        system_tokens = 0
+        for ctx in active_contexts:
+            if ctx.type == 'system':
+                system_contexts.append(ctx)
+                system_tokens += ctx.token_count
+            else:
+                non_system_contexts.append(ctx)
         
-        system_tokens = sum(ctx.token_count for ctx in system_contexts)
         remaining_tokens = target_tokens - system_tokens
         
         if remaining_tokens <= 0:
@@ -254,11 +305,13 @@ class ContextOptimizer:
         # Step 3: Calculate composite scores
         scored_contexts = self._calculate_composite_scores(non_system_contexts)
         
-        # Step 4: Select contexts based on composite scores
-        selected_contexts = system_contexts.copy()
-        current_tokens = system_tokens
+        # Step 4: Select contexts based on composite scores. The leading run
+        # that fits is found in one call; only the rest needs the loop below
+        cutoff, prefix_tokens = self._fit_prefix(scored_contexts, remaining_tokens - system_tokens)
+        selected_contexts = system_contexts + scored_contexts[:cutoff]
+        current_tokens = system_tokens + prefix_tokens
         
-        for context in scored_contexts:
+        for context in scored_contexts[cutoff:]:
             if current_tokens + context.token_count <= remaining_tokens:
                 selected_contexts.append(context)
                 current_tokens += context.token_count
@@ -275,33 +328,28 @@ class ContextOptimizer:
     
     def _filter_active_contexts(self, contexts: List[ContextItem]) -> List[ContextItem]:
         """Filter out expired and very old contexts."""
-        now = datetime.now()
-        max_age = timedelta(hours=self.config['max_age_hours'])
-        
-        active_contexts = []
-        for context in contexts:
-            # Skip expired
-            if context.is_expired():
-                continue
-            
-            # Skip very old (unless high priority or system)
-            if (context.type != 'system' and 
-                context.priority < 8 and
-                now - context.timestamp > max_age):
-                continue
-            
-            active_contexts.append(context)
-        
-        return active_contexts
+        now = time.time()
+        cutoff = now - self.config['max_age_hours'] * 3600
+        
+        # Keep recent contexts (cheapest test first), old ones only if system
+        # or high priority, and drop anything expired as of the same `now`
+        return [context for context in contexts
+                if (context.timestamp >= cutoff or context.type == 'system' or context.priority >= 8)
+                and (context.expiry is None or now <= context.expiry)]
     
     def _calculate_composite_scores(self, contexts: List[ContextItem]) -> List[ContextItem]:
         """Calculate composite scores for context ranking."""
-        now = datetime.now()
+        now = time.time()
+        max_age_hours = self.config['max_age_hours']
+        recency_weight = self.config['recency_weight']
+        
+        if _np is not None and len(contexts) >= _NUMPY_MIN_CONTEXTS:
+            return self._calculate_composite_scores_numpy(contexts, now, max_age_hours, recency_weight)
         
         for context in contexts:
             # Recency score (0-1, higher is more recent)
-            age_hours = (now - context.timestamp).total_seconds() / 3600
-            recency_score = max(0, 1 - (age_hours / self.config['max_age_hours']))
+            age_hours = (now - context.timestamp) / 3600
+            recency_score = max(0, 1 - (age_hours / max_age_hours))
             
             # Priority score (0-1)
             priority_score = context.priority / 10.0
@@ -310,24 +358,54 @@ class ContextOptimizer:
             relevance_score = context.relevance_score
             
             # Type bonus
-            type_bonus = {
-                'system': 1.0,
-                'instructions': 0.9,
-                'conversation': 0.7,
-                'memory': 0.6,
-                'tool_result': 0.5
-            }.get(context.type, 0.5)
+            type_bonus = _TYPE_BONUS.get(context.type, 0.5)
             
             # Composite score
             context.relevance_score = (
                 priority_score * 0.4 +
-                recency_score * self.config['recency_weight'] +
+                recency_score * recency_weight +
                 relevance_score * 0.2 +
                 type_bonus * 0.1
             )
         
         # Sort by composite score
-        return sorted(contexts, key=lambda x: x.relevance_score, reverse=True)
+        return sorted(contexts, key=attrgetter('relevance_score'), reverse=True)
+    
+    def _calculate_composite_scores_numpy(self, contexts: List[ContextItem], now: float,
+                                          max_age_hours: float,
+                                          recency_weight: float) -> List[ContextItem]:
+        """Same scoring as _calculate_composite_scores, computed over float64 columns."""
+        count = len(contexts)
+        priorities = _np.fromiter((ctx.priority for ctx in contexts), dtype=_np.float64, count=count)
+        timestamps = _np.fromiter((ctx.timestamp for ctx in contexts), dtype=_np.float64, count=count)
+        relevance = _np.fromiter((ctx.relevance_score for ctx in contexts), dtype=_np.float64, count=count)
+        type_bonus = _np.fromiter((_TYPE_BONUS.get(ctx.type, 0.5) for ctx in contexts),
+                                  dtype=_np.float64, count=count)
+        
+        # Evaluated in place, in the same operation order as the scalar loop
+        # so ties rank identically; only the input columns are allocated
+        recency = _np.subtract(now, timestamps, out=timestamps)
+        recency /= 3600
+        recency /= max_age_hours
+        _np.subtract(1, recency, out=recency)
+        _np.maximum(recency, 0, out=recency)
+        recency *= recency_weight
+        
+        scores = priorities
+        scores /= 10.0
+        scores *= 0.4
+        scores += recency
+        relevance *= 0.2
+        scores += relevance
+        type_bonus *= 0.1
+        scores += type_bonus
+        
+        for context, score in zip(contexts, scores.tolist()):
+            context.relevance_score = score
+        
+        # Stable descending order, matching sorted(..., reverse=True)
+        order = _np.argsort(-scores, kind='stable')
+        return [contexts[i] for i in order.tolist()]
     
     def _try_compress_context(self, context: ContextItem, 
                              max_tokens: int) -> Optional[ContextItem]:
@@ -335,10 +413,12 @@ class ContextOptimizer:
         if max_tokens < 50:
             return None
         
-        compressed_content = self._compress_content(context.content, max_tokens)
-        if not compressed_content:
+        compressed = self._compress_content(context.content, max_tokens,
+                                            context.token_count, context._tokens)
+        if not compressed:
             return None
         
+        compressed_content, compressed_tokens = compressed
         return ContextItem(
             id=context.id,
             content=compressed_content,
@@ -346,33 +426,55 @@ class ContextOptimizer:
             priority=max(1, context.priority - 1),  # Slight penalty for compression
             timestamp=context.timestamp,
             metadata=context.metadata,
-            token_count=self.token_counter.count_tokens(compressed_content),
+            token_count=compressed_tokens,
             relevance_score=context.relevance_score * 0.9,  # Slight penalty
             expiry=context.expiry,
-            tags=context.tags + ['compressed']
+            tags=context.tags + _COMPRESSED_TAG
         )
     
-    def _compress_content(self, content: str, max_tokens: int) -> Optional[str]:
-        """Compress content to fit within token limit."""
-        current_tokens = self.token_counter.count_tokens(content)
+    def _compress_content(self, content: str, max_tokens: int,
+                          current_tokens: Optional[int] = None,
+                          token_ids: Optional[Sequence[int]] = None) -> Optional[Tuple[str, int]]:
+        """Compress content to fit within token limit.
+        
+        Returns the compressed content with its token count, or None if it
+        cannot be made to fit. Pass current_tokens and token_ids when the
+        caller already has them for content (e.g. ContextItem.token_count and
+        the ids ContextManager kept at ingestion).
+        """
+        if current_tokens is None:
+            current_tokens = self.token_counter.count_tokens(content)
         
         if current_tokens <= max_tokens:
-            return content
-        
-        # Strategy 1: Remove redundant whitespace
-        compressed = re.sub(r'\s+', ' ', content.strip())
-        
-        # Strategy 2: Remove common filler words
-        filler_words = ['very', 'really', 'quite', 'rather', 'somewhat', 'actually', 'basically']
-        for word in filler_words:
-            compressed = re.sub(f'\\b{word}\\b', '', compressed, flags=re.IGNORECASE)
-        
-        # Strategy 3: Truncate if still too long
-        if self.token_counter.count_tokens(compressed) > max_tokens:
-            compressed = self.token_counter.truncate_to_limit(compressed)
-            compressed += "\n[...compressed...]" if len(compressed) < len(content) else ""
+            return content, current_tokens
+        
+        # Strategy 1: Remove common filler words (one pass for all of them)
+        compressed = _FILLER_RE.sub('', content)
+        
+        # Strategy 2: Remove redundant whitespace, including gaps left by fillers
+        compressed = ' '.join(compressed.split())
+        
+        # Strategy 3: Truncate if still too long. The text is tokenized once
+        # and cut on the token ids, rather than re-counted for each attempt
+        tokens = (token_ids if token_ids is not None and compressed == content
+                  else self.token_counter.encode(compressed))
+        keep = max_tokens - self._marker_tokens
+        if tokens is None:  # no tokenizer; count_tokens estimates 4 characters per token
+            compressed_tokens = self.token_counter.count_tokens(compressed)
+            if compressed_tokens > max_tokens:
+                if keep <= 0:
+                    return None
+                compressed = compressed[:keep * 4] + _COMPRESSED_MARKER
+                compressed_tokens = self.token_counter.count_tokens(compressed)
+        elif len(tokens) > max_tokens:
+            if keep <= 0:
+                return None
+            compressed = self.token_counter.decode_prefix(tokens, keep) + _COMPRESSED_MARKER
+            compressed_tokens = self.token_counter.count_tokens(compressed)
+        else:
+            compressed_tokens = len(tokens)
         
-        return compressed if self.token_counter.count_tokens(compressed) <= max_tokens else None
+        return (compressed, compressed_tokens) if compressed_tokens <= max_tokens else None
     
     def _group_contexts_semantically(self, contexts: List[ContextItem]) -> List[List[ContextItem]]:
         """Group contexts by semantic similarity (simplified)."""
@@ -383,11 +485,7 @@ class ContextOptimizer:
         
         for context in contexts:
             # Group key based on type and common tags
-            key_parts = [context.type]
-            if context.tags:
-                key_parts.extend(sorted(context.tags))
-            
-            group_key = '_'.join(key_parts)
+            group_key = (context.type, tuple(sorted(context.tags)) if context.tags else ())
             groups[group_key].append(context)
         
         return list(groups.values())
@@ -397,101 +495,140 @@ class ContextOptimizer:
         # Simple relevance based on recency and frequency of similar content
         content_frequency = Counter()
         
+        # Extract keywords once per context; both passes below reuse them
+        keywords_by_context = []
         for context in contexts:
-            # Extract keywords for frequency analysis
-            words = re.findall(r'\b\w+\b', context.content.lower())
-            for word in words:
-                if len(word) > 3:  # Skip short words
-                    content_frequency[word] += 1
+            keywords = [word for word in _WORD_RE.findall(context._content_lower)
+                        if len(word) > 3]  # Skip short words
+            content_frequency.update(keywords)
+            keywords_by_context.append(keywords)
         
-        for context in contexts:
-            words = re.findall(r'\b\w+\b', context.content.lower())
-            frequency_score = sum(content_frequency.get(word, 0) for word in words if len(word) > 3)
+        if _np is not None and len(contexts) >= _NUMPY_MIN_CONTEXTS:
+            frequency_sums = self._keyword_frequency_sums_numpy(keywords_by_context)
+        else:
+            frequency_sums = [sum(content_frequency[word] for word in keywords)
+                              for keywords in keywords_by_context]
+        
+        for context, frequency_score in zip(contexts, frequency_sums):
             frequency_score = min(1.0, frequency_score / 100)  # Normalize
             
             # Combine with existing relevance
             context.relevance_score = (context.relevance_score + frequency_score) / 2
     
-    def suggest_optimization_strategy(self, contexts: List[ContextItem]) -> str:
+    def _keyword_frequency_sums_numpy(self, keywords_by_context: List[List[str]]) -> List[int]:
+        """Per-context sum of corpus keyword frequencies, via bincount over word ids."""
+        word_ids: Dict[str, int] = {}
+        ids = _np.fromiter((word_ids.setdefault(word, len(word_ids))
+                            for keywords in keywords_by_context for word in keywords),
+                           dtype=_np.intp)
+        if not ids.size:
+            return [0] * len(keywords_by_context)
+        
+        # Frequency of each word id, looked up for every occurrence, then
+        # summed per context through the running total at each boundary
+        occurrence_freq = _np.bincount(ids)[ids]
+        ends = _np.cumsum([len(keywords) for keywords in keywords_by_context])
+        running = _np.concatenate(([0], _np.cumsum(occurrence_freq)))
+        return _np.diff(running[_np.concatenate(([0], ends))]).tolist()
+    
+    def suggest_optimization_strategy(self, contexts: List[ContextItem],
+                                      stats: Optional[_AnalysisStats] = None) -> str:
         """Suggest the best optimization strategy based on context characteristics."""
-        total_tokens = sum(ctx.token_count for ctx in contexts)
+        if stats is None:
+            if sum(ctx.token_count for ctx in contexts) <= self.max_tokens:
+                return 'none'
+            stats = self._analyze(contexts)
         
-        if total_tokens <= self.max_tokens:
+        if stats.total_tokens <= self.max_tokens:
             return 'none'
         
         # Analyze context characteristics
-        type_distribution = Counter(ctx.type for ctx in contexts)
-        priority_distribution = Counter(ctx.priority for ctx in contexts)
-        
-        # Check recency spread
-        if contexts:
-            oldest = min(ctx.timestamp for ctx in contexts)
-            newest = max(ctx.timestamp for ctx in contexts)
-            age_spread = (newest - oldest).total_seconds() / 3600  # hours
-        else:
-            age_spread = 0
+        age_spread = (stats.newest - stats.oldest) / 3600  # hours
         
         # Decision logic
-        if len(type_distribution) > 3 and age_spread > 48:
+        if len(stats.type_dist) > 3 and age_spread > 48:
             return 'hybrid'
-        elif max(priority_distribution.values()) > len(contexts) * 0.7:
+        elif stats.max_priority_count > stats.total_contexts * 0.7:
             return 'priority_based'
         elif age_spread > 24:
             return 'recency_based'
-        elif total_tokens > self.max_tokens * 1.5:
+        elif stats.total_tokens > self.max_tokens * 1.5:
             return 'compression'
         else:
             return 'relevance_based'
     
     def get_optimization_report(self, contexts: List[ContextItem]) -> Dict[str, Any]:
         """Generate detailed optimization analysis report."""
-        total_tokens = sum(ctx.token_count for ctx in contexts)
-        
-        # Distribution analysis
-        type_dist = Counter(ctx.type for ctx in contexts)
-        priority_dist = Counter(ctx.priority for ctx in contexts)
+        stats = self._analyze(contexts)
         
-        # Token analysis by category
-        tokens_by_type = defaultdict(int)
-        for ctx in contexts:
-            tokens_by_type[ctx.type] += ctx.token_count
+        return {
+            'total_contexts': stats.total_contexts,
+            'total_tokens': stats.total_tokens,
+            'max_tokens': self.max_tokens,
+            'tokens_over_limit': max(0, stats.total_tokens - self.max_tokens),
+            'optimization_needed': stats.total_tokens > self.max_tokens,
+            'suggested_strategy': self.suggest_optimization_strategy(contexts, stats),
+            'distribution': {
+                'by_type': dict(stats.type_dist),
+                'by_priority': dict(stats.priority_dist),
+                'by_age': stats.age_groups
+            },
+            'tokens_by_type': dict(stats.tokens_by_type),
+            'compression_potential': self._estimate_compression_potential(contexts, stats)
+        }
+    
+    def _analyze(self, contexts: List[ContextItem]) -> _AnalysisStats:
+        """Collect everything the report and its helpers need in a single pass."""
+        stats = _AnalysisStats(total_contexts=len(contexts))
+        if contexts:
+            stats.oldest = stats.newest = contexts[0].timestamp
         
-        # Age analysis
-        now = datetime.now()
-        age_groups = {'recent': 0, 'medium': 0, 'old': 0}
+        now = time.time()
+        type_dist = stats.type_dist
+        priority_dist = stats.priority_dist
+        tokens_by_type = stats.tokens_by_type
+        age_groups = stats.age_groups
         
         for ctx in contexts:
-            age_hours = (now - ctx.timestamp).total_seconds() / 3600
+            stats.total_tokens += ctx.token_count
+            type_dist[ctx.type] = type_dist.get(ctx.type, 0) + 1
+            tokens_by_type[ctx.type] = tokens_by_type.get(ctx.type, 0) + ctx.token_count
+            count = priority_dist.get(ctx.priority, 0) + 1
+            priority_dist[ctx.priority] = count
+            if count > stats.max_priority_count:
+                stats.max_priority_count = count
+            
+            if ctx.timestamp < stats.oldest:
+                stats.oldest = ctx.timestamp
+            elif ctx.timestamp > stats.newest:
+                stats.newest = ctx.timestamp
+            
+            age_hours = (now - ctx.timestamp) / 3600
             if age_hours <= 24:
                 age_groups['recent'] += 1
             elif age_hours <= 168:  # 1 week
                 age_groups['medium'] += 1
             else:
                 age_groups['old'] += 1
+            
+            stats.total_chars += len(ctx.content)
+            # str.split() breaks on exactly the characters regex \s matches
+            stats.whitespace_chars += len(ctx.content) - len(''.join(ctx.content.split()))
+            if ctx.token_count > 200 and ctx.type != 'system':
+                stats.compressible_contexts += 1
         
-        return {
-            'total_contexts': len(contexts),
-            'total_tokens': total_tokens,
-            'max_tokens': self.max_tokens,
-            'tokens_over_limit': max(0, total_tokens - self.max_tokens),
-            'optimization_needed': total_tokens > self.max_tokens,
-            'suggested_strategy': self.suggest_optimization_strategy(contexts),
-            'distribution': {
-                'by_type': dict(type_dist),
-                'by_priority': dict(priority_dist),
-                'by_age': age_groups
-            },
-            'tokens_by_type': dict(tokens_by_type),
-            'compression_potential': self._estimate_compression_potential(contexts)
-        }
+        return stats
     
-    def _estimate_compression_potential(self, contexts: List[ContextItem]) -> Dict[str, Any]:
+    def _estimate_compression_potential(self, contexts: List[ContextItem],
+                                        stats: Optional[_AnalysisStats] = None) -> Dict[str, Any]:
         """Estimate how much contexts could be compressed."""
-        total_chars = sum(len(ctx.content) for ctx in contexts)
-        total_tokens = sum(ctx.token_count for ctx in contexts)
+        if stats is None:
+            stats = self._analyze(contexts)
         
         # Estimate whitespace and redundancy
-        whitespace_chars = sum(len(re.findall(r'\s', ctx.content)) for ctx in contexts)
+        total_chars = stats.total_chars
+        whitespace_chars = stats.whitespace_chars
+        
         whitespace_ratio = whitespace_chars / total_chars if total_chars > 0 else 0
         
         # Rough compression estimate
@@ -499,7 +636,6 @@ class ContextOptimizer:
         
         return {
             'estimated_ratio': estimated_compression,
-            'potential_token_savings': int(total_tokens * estimated_compression),
-            'compressible_contexts': len([ctx for ctx in contexts 
-                                        if ctx.token_count > 200 and ctx.type != 'system'])
+            'potential_token_savings': int(stats.total_tokens * estimated_compression),
+            'compressible_contexts': stats.compressible_contexts
         }
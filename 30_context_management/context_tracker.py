@@ -1,27 +1,53 @@
 """Context usage tracking and analytics."""
 
 import json
+import random
+import sys
+import threading
+import time
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
 from dataclasses import dataclass, field
+from functools import wraps
+from itertools import islice
+from operator import attrgetter
+
+try:
+    import numpy as _np
+except ImportError:  # analytics scan the event deque in pure Python instead
+    _np = None
+
+try:
+    import msgspec as _msgspec
+except ImportError:  # tracking data is persisted as JSON only
+    _msgspec = None
 
 from ..10_core_utils import Logger, FileHandler
 
+# Below this many events, building the NumPy masks costs more than it saves
+_NUMPY_MIN_EVENTS = 256
 
-@dataclass
+
+@dataclass(slots=True)
 class ContextEvent:
     """Represents a context-related event."""
-    timestamp: datetime
+    timestamp: float  # epoch seconds
     event_type: str  # added, removed, accessed, optimized
     context_id: str
     context_type: str
     token_count: int
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    def __post_init__(self):
+        # Interned so the analytics' comparisons against literals like
+        # 'added' hit the identity fast path, including for loaded events
+        self.event_type = sys.intern(self.event_type)
+        self.context_type = sys.intern(self.context_type)
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
-            'timestamp': self.timestamp.isoformat(),
+            'timestamp': datetime.fromtimestamp(self.timestamp).isoformat(),
             'event_type': self.event_type,
             'context_id': self.context_id,
             'context_type': self.context_type,
@@ -31,11 +57,14 @@ class ContextEvent:
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ContextEvent':
-        data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+        # Saved events carry epoch floats; ISO strings come from older files
+        # and to_dict() output
+        if isinstance(data['timestamp'], str):
+            data['timestamp'] = datetime.fromisoformat(data['timestamp']).timestamp()
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class UsageSession:
     """Tracks context usage during a session."""
     session_id: str
@@ -47,38 +76,172 @@ class UsageSession:
     context_types_used: Dict[str, int] = field(default_factory=dict)
     
 
+class _LocalPeriod:
+    """The local hour or day containing a timestamp, cached until a timestamp falls outside it.
+    
+    Events arrive in time order, so nearly every lookup is a range check
+    instead of a datetime conversion plus strftime.
+    """
+    
+    def __init__(self, key_format: str, hours: int):
+        self.key_format = key_format
+        self.hours = hours
+        self.key = ''
+        self.hour = 0
+        self.start = self.end = 0.0
+    
+    def __call__(self, timestamp: float) -> '_LocalPeriod':
+        if not self.start <= timestamp < self.end:
+            start = datetime.fromtimestamp(timestamp).replace(minute=0, second=0, microsecond=0)
+            if self.hours == 24:
+                start = start.replace(hour=0)
+            self.key = start.strftime(self.key_format)
+            self.hour = start.hour
+            self.start = start.timestamp()
+            self.end = (start + timedelta(hours=self.hours)).timestamp()
+        return self
+
+
+class _EventColumns:
+    """Fixed-capacity NumPy columns mirroring ContextTracker.events.
+    
+    Rows are written round-robin with the same capacity as the events deque,
+    so both drop the same oldest event; ordered() returns a column oldest
+    first, aligned with the deque's indexes. Event and context types are
+    stored as small integer codes.
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = _np.empty(capacity, dtype=_np.float64)
+        self.token_counts = _np.empty(capacity, dtype=_np.int64)
+        self.event_types = _np.empty(capacity, dtype=_np.int32)
+        self.context_types = _np.empty(capacity, dtype=_np.int32)
+        self.event_type_codes: Dict[str, int] = {}
+        self.context_type_codes: Dict[str, int] = {}
+        self.head = 0  # next row to write
+        self.size = 0
+    
+    def append(self, event: 'ContextEvent'):
+        row = self.head
+        event_type_codes = self.event_type_codes
+        context_type_codes = self.context_type_codes
+        event_code = event_type_codes.get(event.event_type)
+        if event_code is None:
+            event_code = event_type_codes[event.event_type] = len(event_type_codes)
+        context_code = context_type_codes.get(event.context_type)
+        if context_code is None:
+            context_code = context_type_codes[event.context_type] = len(context_type_codes)
+        
+        self.timestamps[row] = event.timestamp
+        self.token_counts[row] = event.token_count
+        self.event_types[row] = event_code
+        self.context_types[row] = context_code
+        
+        row += 1
+        self.head = row if row < self.capacity else 0
+        if self.size < self.capacity:
+            self.size += 1
+    
+    def ordered(self, column):
+        """The filled part of column, oldest event first."""
+        if self.size < self.capacity:
+            return column[:self.size]
+        return _np.concatenate((column[self.head:], column[:self.head]))
+    
+    def recent(self, column, count: int):
+        """The newest count rows of column, oldest first; a view unless they wrap around."""
+        count = min(count, self.size)
+        start = self.head - count
+        if start >= 0:
+            return column[start:self.head]
+        return _np.concatenate((column[start:], column[:self.head]))
+    
+    def event_type_code(self, event_type: str) -> int:
+        return self.event_type_codes.get(event_type, -1)
+    
+    def event_type_mask(self, event_type: str):
+        return self.ordered(self.event_types) == self.event_type_code(event_type)
+    
+    @staticmethod
+    def counts(values, codes: Dict[str, int]) -> Dict[str, int]:
+        """Occurrences of each code in values, keyed by name in first-seen order."""
+        if not values.size:
+            return {}
+        unique, first_seen, counts = _np.unique(values, return_index=True, return_counts=True)
+        names = {code: name for name, code in codes.items()}
+        order = _np.argsort(first_seen, kind='stable')
+        return {names[int(unique[i])]: int(counts[i]) for i in order}
+
+
+def _after_load(method):
+    """Run a ContextTracker method once the background load of saved data has finished."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._loaded.wait()
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
 class ContextTracker:
     """Tracks context usage patterns and provides analytics."""
     
-    def __init__(self, agent_id: str, max_history: int = 10000):
+    def __init__(self, agent_id: str, max_history: int = 10000, access_sample_rate: float = 0.0):
         self.agent_id = agent_id
         self.max_history = max_history
+        # Fraction of context accesses also recorded as events; every access
+        # is counted in _access_counts regardless
+        self.access_sample_rate = access_sample_rate
         self.logger = Logger(f"ContextTracker_{agent_id}")
         self.file_handler = FileHandler()
         
         # Event tracking
         self.events: deque = deque(maxlen=max_history)
+        self._columns: Optional[_EventColumns] = (_EventColumns(max_history)
+                                                  if _np is not None and max_history > 0 else None)
+        # context_id -> its events still in the deque, oldest first
+        self._events_by_context: Dict[str, deque] = {}
+        self._hour_period = _LocalPeriod('%Y-%m-%d_%H', hours=1)
+        self._day_period = _LocalPeriod('%Y-%m-%d', hours=24)
+        self._evicted_hour_period = _LocalPeriod('%Y-%m-%d_%H', hours=1)  # trails the oldest event
+        
+        # Running aggregates over the events deque, kept in step with eviction
+        self._hourly_activity: Counter = Counter()
+        self._added_type_counts: Counter = Counter()
+        self._optimizations: deque = deque()
+        self._access_counts: Counter = Counter()
         self.current_session: Optional[UsageSession] = None
         
         # Analytics data
-        self.hourly_stats = defaultdict(lambda: {
+        self.hourly_stats = defaultdict(lambda: Counter({
             'contexts_added': 0,
             'contexts_removed': 0,
             'tokens_peak': 0,
             'optimizations': 0
-        })
+        }))
         
         self.daily_stats = defaultdict(lambda: {
             'total_contexts': 0,
             'total_tokens': 0,
             'unique_types': set(),
             'sessions': 0,
-            'avg_session_length': 0
+            'sum_session_length': 0.0  # average is derived in _daily_stats_snapshot
         })
         
-        # Load existing data
-        self._load_tracking_data()
+        # Load existing data in the background; public methods wait on
+        # _loaded, so the constructor returns before the file is parsed
+        self._loaded = threading.Event()
+        self._load_thread = threading.Thread(target=self._load_tracking_data_and_signal,
+                                             name=f"ContextTrackerLoad_{agent_id}", daemon=True)
+        self._load_thread.start()
+    
+    def _load_tracking_data_and_signal(self):
+        try:
+            self._load_tracking_data()
+        finally:
+            self._loaded.set()
     
+    @_after_load
     def start_session(self, session_id: Optional[str] = None) -> str:
         """Start a new tracking session."""
         session_id = session_id or f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -94,6 +257,7 @@ class ContextTracker:
         self.logger.info(f"Started tracking session: {session_id}")
         return session_id
     
+    @_after_load
     def end_session(self):
         """End the current tracking session."""
         if not self.current_session:
@@ -108,20 +272,17 @@ class ContextTracker:
         # Calculate session length
         if self.current_session.end_time:
             session_length = (self.current_session.end_time - self.current_session.start_time).total_seconds()
-            self.daily_stats[date_key]['avg_session_length'] = (
-                (self.daily_stats[date_key]['avg_session_length'] * 
-                 (self.daily_stats[date_key]['sessions'] - 1) + session_length) /
-                self.daily_stats[date_key]['sessions']
-            )
+            self.daily_stats[date_key]['sum_session_length'] += session_length
         
         self.logger.info(f"Ended tracking session: {self.current_session.session_id}")
         self.current_session = None
     
+    @_after_load
     def track_context_added(self, context_id: str, context_type: str, 
                            token_count: int, metadata: Optional[Dict[str, Any]] = None):
         """Track context addition."""
         event = ContextEvent(
-            timestamp=datetime.now(),
+            timestamp=time.time(),
             event_type='added',
             context_id=context_id,
             context_type=context_type,
@@ -133,11 +294,12 @@ class ContextTracker:
         self._update_session_stats('added', context_type, token_count)
         self._update_hourly_stats('contexts_added')
     
+    @_after_load
     def track_context_removed(self, context_id: str, context_type: str, 
                              token_count: int, reason: str = 'manual'):
         """Track context removal."""
         event = ContextEvent(
-            timestamp=datetime.now(),
+            timestamp=time.time(),
             event_type='removed',
             context_id=context_id,
             context_type=context_type,
@@ -148,11 +310,21 @@ class ContextTracker:
         self._add_event(event)
         self._update_hourly_stats('contexts_removed')
     
+    @_after_load
     def track_context_accessed(self, context_id: str, context_type: str, 
                               token_count: int, access_type: str = 'read'):
-        """Track context access."""
+        """Track context access.
+        
+        Accesses are counted per context; only a sample (access_sample_rate)
+        become events, so reads don't evict added/removed/optimized events
+        from the history.
+        """
+        self._access_counts[context_id] += 1
+        if self.access_sample_rate < 1 and random.random() >= self.access_sample_rate:
+            return
+        
         event = ContextEvent(
-            timestamp=datetime.now(),
+            timestamp=time.time(),
             event_type='accessed',
             context_id=context_id,
             context_type=context_type,
@@ -162,11 +334,12 @@ class ContextTracker:
         
         self._add_event(event)
     
+    @_after_load
     def track_optimization(self, contexts_before: int, contexts_after: int,
                           tokens_before: int, tokens_after: int, strategy: str):
         """Track context optimization."""
         event = ContextEvent(
-            timestamp=datetime.now(),
+            timestamp=time.time(),
             event_type='optimized',
             context_id='optimization',
             context_type='system',
@@ -190,14 +363,17 @@ class ContextTracker:
     
     def _add_event(self, event: ContextEvent):
         """Add event to tracking history."""
+        self._index_event(event)
         self.events.append(event)
+        if self._columns is not None:
+            self._columns.append(event)
         
-        # Update daily stats
-        date_key = event.timestamp.strftime('%Y-%m-%d')
+        # Update daily stats (one day-bucket lookup, and none for non-add events)
         if event.event_type == 'added':
-            self.daily_stats[date_key]['total_contexts'] += 1
-            self.daily_stats[date_key]['total_tokens'] += event.token_count
-            self.daily_stats[date_key]['unique_types'].add(event.context_type)
+            day_stats = self.daily_stats[self._day_period(event.timestamp).key]
+            day_stats['total_contexts'] += 1
+            day_stats['total_tokens'] += event.token_count
+            day_stats['unique_types'].add(event.context_type)
     
     def _update_session_stats(self, event_type: str, context_type: str, token_count: int):
         """Update current session statistics."""
@@ -213,29 +389,91 @@ class ContextTracker:
                 self.current_session.context_types_used.get(context_type, 0) + 1
             )
     
+    def _use_columns(self) -> bool:
+        return self._columns is not None and len(self.events) >= _NUMPY_MIN_EVENTS
+    
+    def _index_event(self, event: ContextEvent):
+        """Fold event into the indexes and aggregates, first dropping whatever the deque will evict."""
+        if self.max_history <= 0:
+            return
+        
+        if len(self.events) == self.max_history:
+            self._unindex_event(self.events[0])
+        
+        self._events_by_context.setdefault(event.context_id, deque()).append(event)
+        self._hourly_activity[self._hour_period(event.timestamp).hour] += 1
+        if event.event_type == 'added':
+            self._added_type_counts[event.context_type] += 1
+        elif event.event_type == 'optimized':
+            self._optimizations.append(event)
+    
+    def _unindex_event(self, event: ContextEvent):
+        """Remove the oldest event from the indexes and aggregates."""
+        context_events = self._events_by_context[event.context_id]
+        context_events.popleft()
+        if not context_events:
+            del self._events_by_context[event.context_id]
+        
+        self._decrement(self._hourly_activity, self._evicted_hour_period(event.timestamp).hour)
+        if event.event_type == 'added':
+            self._decrement(self._added_type_counts, event.context_type)
+        elif event.event_type == 'optimized':
+            self._optimizations.popleft()
+    
+    @staticmethod
+    def _decrement(counter: Counter, key):
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
+    
+    def _rebuild_event_indexes(self):
+        """Rebuild the indexes, aggregates and NumPy columns from the events deque."""
+        self._events_by_context = {}
+        self._hourly_activity = Counter(self._hour_period(e.timestamp).hour for e in self.events)
+        self._added_type_counts = Counter(e.context_type for e in self.events if e.event_type == 'added')
+        self._optimizations = deque(e for e in self.events if e.event_type == 'optimized')
+        for event in self.events:
+            self._events_by_context.setdefault(event.context_id, deque()).append(event)
+        
+        if _np is None or self.max_history <= 0:
+            return
+        
+        self._columns = _EventColumns(self.max_history)
+        for event in self.events:
+            self._columns.append(event)
+    
     def _update_hourly_stats(self, stat_key: str):
         """Update hourly statistics."""
-        hour_key = datetime.now().strftime('%Y-%m-%d_%H')
+        hour_key = self._hour_period(time.time()).key
         self.hourly_stats[hour_key][stat_key] += 1
     
+    @_after_load
     def get_usage_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get usage summary for specified time period."""
-        cutoff = datetime.now() - timedelta(hours=hours)
-        recent_events = [e for e in self.events if e.timestamp > cutoff]
-        
-        # Count events by type
-        event_counts = defaultdict(int)
-        type_usage = defaultdict(int)
-        total_tokens = 0
+        cutoff = time.time() - hours * 3600
+        
+        if self._use_columns():
+            columns = self._columns
+            recent = columns.ordered(columns.timestamps) > cutoff
+            added = columns.event_type_mask('added')
+            event_counts = Counter(columns.counts(columns.ordered(columns.event_types)[recent],
+                                                  columns.event_type_codes))
+            type_usage = Counter(columns.counts(columns.ordered(columns.context_types)[recent],
+                                                columns.context_type_codes))
+            total_tokens = int(columns.ordered(columns.token_counts)[recent & added].sum())
+            total_events = int(recent.sum())
+        else:
+            recent_events = [e for e in self.events if e.timestamp > cutoff]
+            
+            # Count events by type
+            event_counts = Counter(map(attrgetter('event_type'), recent_events))
+            type_usage = Counter(map(attrgetter('context_type'), recent_events))
+            total_tokens = sum(e.token_count for e in recent_events if e.event_type == 'added')
+            total_events = len(recent_events)
         
-        for event in recent_events:
-            event_counts[event.event_type] += 1
-            type_usage[event.context_type] += 1
-            if event.event_type == 'added':
-                total_tokens += event.token_count
+        optimizations = [e for e in self._optimizations if e.timestamp > cutoff]
         
         # Calculate optimization efficiency
-        optimizations = [e for e in recent_events if e.event_type == 'optimized']
         avg_compression = 0
         if optimizations:
             compressions = [e.metadata.get('compression_ratio', 0) for e in optimizations]
@@ -243,7 +481,7 @@ class ContextTracker:
         
         return {
             'time_period_hours': hours,
-            'total_events': len(recent_events),
+            'total_events': total_events,
             'events_by_type': dict(event_counts),
             'contexts_by_type': dict(type_usage),
             'total_tokens_added': total_tokens,
@@ -252,39 +490,42 @@ class ContextTracker:
             'current_session': self.current_session.session_id if self.current_session else None
         }
     
+    @_after_load
     def get_context_lifecycle(self, context_id: str) -> List[ContextEvent]:
         """Get all events for a specific context."""
-        return [e for e in self.events if e.context_id == context_id]
+        return list(self._events_by_context.get(context_id, ()))
+    
+    @_after_load
+    def get_access_count(self, context_id: str) -> int:
+        """Number of times a context was accessed, including unsampled accesses."""
+        return self._access_counts[context_id]
     
+    @_after_load
     def get_optimization_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent optimization events."""
-        optimizations = [e for e in reversed(self.events) if e.event_type == 'optimized']
-        return [opt.to_dict() for opt in optimizations[:limit]]
+        if limit < 0:  # slice semantics: all but the oldest -limit
+            optimizations = list(reversed(self._optimizations))[:limit]
+        else:
+            optimizations = islice(reversed(self._optimizations), limit)
+        return [opt.to_dict() for opt in optimizations]
     
+    @_after_load
     def analyze_usage_patterns(self) -> Dict[str, Any]:
         """Analyze usage patterns and provide insights."""
         if not self.events:
             return {'insights': ['No usage data available']}
         
-        # Analyze peak usage times
-        hourly_activity = defaultdict(int)
-        for event in self.events:
-            hour = event.timestamp.hour
-            hourly_activity[hour] += 1
-        
-        peak_hour = max(hourly_activity.items(), key=lambda x: x[1])[0] if hourly_activity else 0
-        
-        # Analyze context type preferences
-        type_frequency = defaultdict(int)
-        for event in self.events:
-            if event.event_type == 'added':
-                type_frequency[event.context_type] += 1
+        # Peak usage times and context type preferences come from the
+        # running aggregates rather than a rescan of the history
+        hourly_activity = self._hourly_activity
+        type_frequency = self._added_type_counts
+        optimization_count = len(self._optimizations)
         
-        most_used_type = max(type_frequency.items(), key=lambda x: x[1])[0] if type_frequency else 'unknown'
+        peak_hour = hourly_activity.most_common(1)[0][0] if hourly_activity else 0
+        most_used_type = type_frequency.most_common(1)[0][0] if type_frequency else 'unknown'
         
         # Calculate optimization frequency
-        optimization_events = [e for e in self.events if e.event_type == 'optimized']
-        optimization_frequency = len(optimization_events) / len(self.events) if self.events else 0
+        optimization_frequency = optimization_count / len(self.events) if self.events else 0
         
         # Generate insights
         insights = []
@@ -302,11 +543,20 @@ class ContextTracker:
             insights.append("Low optimization frequency - context limits may be too high")
         
         # Analyze recent trends
-        recent_events = list(self.events)[-100:] if len(self.events) >= 100 else list(self.events)
-        if len(recent_events) >= 10:
-            recent_adds = len([e for e in recent_events if e.event_type == 'added'])
-            recent_removes = len([e for e in recent_events if e.event_type == 'removed'])
-            
+        if self._use_columns():
+            columns = self._columns
+            recent_types = columns.recent(columns.event_types, 100)
+            recent_count = len(recent_types)
+            recent_adds = int((recent_types == columns.event_type_code('added')).sum())
+            recent_removes = int((recent_types == columns.event_type_code('removed')).sum())
+        else:
+            # Walk back from the newest event instead of copying the deque
+            recent_types = Counter(map(attrgetter('event_type'), islice(reversed(self.events), 100)))
+            recent_count = min(len(self.events), 100)
+            recent_adds = recent_types['added']
+            recent_removes = recent_types['removed']
+        
+        if recent_count >= 10:
             if recent_removes > recent_adds * 1.5:
                 insights.append("High context removal rate - contexts may be expiring too quickly")
             elif recent_adds > recent_removes * 1.5:
@@ -322,9 +572,10 @@ class ContextTracker:
             'type_frequency': dict(type_frequency)
         }
     
+    @_after_load
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get performance-related metrics."""
-        optimization_events = [e for e in self.events if e.event_type == 'optimized']
+        optimization_events = self._optimizations
         
         if not optimization_events:
             return {'no_optimization_data': True}
@@ -352,6 +603,7 @@ class ContextTracker:
             ))
         }
     
+    @_after_load
     def export_analytics(self, file_path: Optional[str] = None) -> str:
         """Export analytics data to file."""
         if not file_path:
@@ -367,10 +619,8 @@ class ContextTracker:
             'usage_patterns': self.analyze_usage_patterns(),
             'performance_metrics': self.get_performance_metrics(),
             'hourly_stats': dict(self.hourly_stats),
-            'daily_stats': {
-                k: {**v, 'unique_types': list(v['unique_types'])} 
-                for k, v in self.daily_stats.items()
-            }
+            'daily_stats': self._daily_stats_snapshot(),
+            'access_counts': dict(self._access_counts)
         }
         
         success = self.file_handler.save_json(analytics_data, file_path)
@@ -382,17 +632,26 @@ class ContextTracker:
             self.logger.error(f"Failed to export analytics to {file_path}")
             return ""
     
+    def _daily_stats_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Serializable daily stats, with avg_session_length derived from the running sum."""
+        return {
+            k: {**v, 'unique_types': list(v['unique_types']),
+                'avg_session_length': v['sum_session_length'] / v['sessions'] if v['sessions'] else 0}
+            for k, v in self.daily_stats.items()
+        }
+    
+    @_after_load
     def save_tracking_data(self) -> bool:
         """Save tracking data to file."""
         try:
             tracking_data = {
                 'agent_id': self.agent_id,
-                'events': [event.to_dict() for event in self.events],
-                'hourly_stats': dict(self.hourly_stats),
-                'daily_stats': {
-                    k: {**v, 'unique_types': list(v['unique_types'])} 
-                    for k, v in self.daily_stats.items()
-                },
+                # Events go to the JSON encoder as dataclasses (epoch-float
+                # timestamps, which from_dict accepts), skipping to_dict
+                'events': list(self.events),
+                'hourly_stats': {hour: dict(stats) for hour, stats in self.hourly_stats.items()},
+                'daily_stats': self._daily_stats_snapshot(),
+                'access_counts': dict(self._access_counts),
                 'current_session': {
                     'session_id': self.current_session.session_id,
                     'start_time': self.current_session.start_time.isoformat(),
@@ -404,38 +663,58 @@ class ContextTracker:
                 'saved_at': datetime.now().isoformat()
             }
             
-            file_path = self.file_handler.base_dir / 'tracking' / f"{self.agent_id}_tracking.json"
-            return self.file_handler.save_json(tracking_data, file_path)
+            # MessagePack is ~3x smaller and faster to encode than indented
+            # JSON; metadata msgspec can't encode falls back to the JSON file
+            if _msgspec is not None and self.file_handler.save_msgpack(
+                    tracking_data, self._tracking_file('msgpack')):
+                return True
+            return self.file_handler.save_json(tracking_data, self._tracking_file('json'))
             
         except Exception as e:
             self.logger.error(f"Failed to save tracking data: {e}")
             return False
     
+    def _tracking_file(self, suffix: str):
+        """Path of this agent's tracking file with the given extension."""
+        return self.file_handler.base_dir / 'tracking' / f"{self.agent_id}_tracking.{suffix}"
+    
     def _load_tracking_data(self) -> bool:
         """Load tracking data from file."""
         try:
-            file_path = self.file_handler.base_dir / 'tracking' / f"{self.agent_id}_tracking.json"
-            
-            if not file_path.exists():
+            # Whichever of the MessagePack and JSON files was written last wins
+            suffixes = ('msgpack', 'json') if _msgspec is not None else ('json',)
+            candidates = [path for path in map(self._tracking_file, suffixes) if path.exists()]
+            if not candidates:
                 return True  # No tracking file yet
             
-            data = self.file_handler.load_json(file_path)
+            file_path = max(candidates, key=lambda path: path.stat().st_mtime)
+            if file_path.suffix == '.msgpack':
+                data = self.file_handler.load_msgpack(file_path)
+            else:
+                data = self.file_handler.load_json(file_path)
             if not data:
                 return False
             
             # Load events
-            for event_data in data.get('events', []):
-                event = ContextEvent.from_dict(event_data)
-                self.events.append(event)
+            self.events.extend(map(ContextEvent.from_dict, data.get('events', [])))
+            self._rebuild_event_indexes()
             
             # Load stats
-            self.hourly_stats.update(data.get('hourly_stats', {}))
+            for hour, stats in data.get('hourly_stats', {}).items():
+                self.hourly_stats[hour] = Counter(stats)
             
             daily_stats_data = data.get('daily_stats', {})
             for date, stats in daily_stats_data.items():
                 self.daily_stats[date] = stats.copy()
                 # Convert unique_types back to set
                 self.daily_stats[date]['unique_types'] = set(stats.get('unique_types', []))
+                # Files written before the running sum only carry the average
+                self.daily_stats[date].setdefault(
+                    'sum_session_length',
+                    stats.get('avg_session_length', 0) * stats.get('sessions', 0))
+                self.daily_stats[date].pop('avg_session_length', None)
+            
+            self._access_counts.update(data.get('access_counts', {}))
             
             # Load current session if exists
             session_data = data.get('current_session')
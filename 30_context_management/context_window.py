@@ -1,10 +1,47 @@
 """Context window management for optimal token usage."""
 
-from typing import List, Dict, Any, Optional, Tuple
+import heapq
+import json
+import re
+from collections import OrderedDict
+from itertools import chain
+from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass
+from operator import attrgetter
 from ..10_core_utils import TokenCounter, Logger
 from .context_manager import ContextItem
 
+_TOKEN_COUNT_CACHE_SIZE = 256
+_SECTION_BLOCK_CACHE_SIZE = 64
+_DEFAULT_REQUIRED_SECTIONS = frozenset({'system', 'instructions'})
+
+# Sections that open every window in this fixed order, so the prefix is
+# byte-identical across turns and provider prompt caches keep hitting
+_STABLE_SECTIONS = {'system': 0, 'instructions': 1, 'tools': 2}
+_TRAILING_SPACE_RE = re.compile(r'[ \t]+$', re.MULTILINE)
+
+
+def _coerce_to_text(content: Any) -> str:
+    """Section content as text; lists and dicts become compact, key-sorted JSON.
+    
+    Canonical JSON has stable bytes across runs (unlike the dict repr) and
+    spends fewer tokens on quotes and separators.
+    """
+    if isinstance(content, str):
+        return content
+    if isinstance(content, (list, dict)):
+        try:
+            return json.dumps(content, sort_keys=True, separators=(',', ':'),
+                              ensure_ascii=False, default=str)
+        except TypeError:  # keys of mixed types can't be sorted
+            return str(content)
+    return content
+
+
+def _normalize_stable(text: str) -> str:
+    """Canonical bytes for a stable section: LF line endings, no trailing spaces."""
+    return _TRAILING_SPACE_RE.sub('', text.replace('\r\n', '\n'))
+
 
 @dataclass
 class WindowSection:
@@ -19,8 +56,11 @@ class WindowSection:
 class ContextWindow:
     """Manages context window construction and optimization."""
     
-    def __init__(self, max_tokens: int = 100000):
+    def __init__(self, max_tokens: int = 100000, strategy: str = 'priority'):
         self.max_tokens = max_tokens
+        # 'priority' fills optional sections in priority order up to the first
+        # that doesn't fit; 'density' packs by priority per token instead
+        self.strategy = strategy
         self.logger = Logger("ContextWindow")
         self.token_counter = TokenCounter()
         
@@ -40,20 +80,72 @@ class ContextWindow:
         
         # Reserve tokens for response
         self.response_buffer = 4000
+        
+        # LRU of text -> token count. Section contents repeat across turns
+        # and between build_window, analyze/suggest and get_window_usage
+        self._token_counts: 'OrderedDict[str, int]' = OrderedDict()
+        # LRU of (name, content) -> formatted block, so between turns only
+        # sections whose content changed are formatted again
+        self._section_blocks: 'OrderedDict[Tuple[str, str], str]' = OrderedDict()
+    
+    def _count_tokens(self, text: str) -> int:
+        """Token count for text, memoized on the string itself."""
+        count = self._token_counts.get(text)
+        if count is not None:
+            self._token_counts.move_to_end(text)
+            return count
+        
+        count = self.token_counter.count_tokens(text)
+        self._token_counts[text] = count
+        if len(self._token_counts) > _TOKEN_COUNT_CACHE_SIZE:
+            self._token_counts.popitem(last=False)
+        return count
+    
+    def _count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Token counts for texts, tokenizing the cache misses in one batch call."""
+        counts = [self._token_counts.get(text) for text in texts]
+        misses = list({text: None for text, count in zip(texts, counts) if count is None})
+        if misses:
+            fresh = dict(zip(misses, self.token_counter.count_tokens_batch(misses)))
+            counts = [fresh[text] if count is None else count for text, count in zip(texts, counts)]
+        
+        for text, count in zip(texts, counts):
+            self._token_counts[text] = count
+            self._token_counts.move_to_end(text)
+        while len(self._token_counts) > _TOKEN_COUNT_CACHE_SIZE:
+            self._token_counts.popitem(last=False)
+        return counts
     
     def build_window(self, sections: Dict[str, Any], 
-                    required_sections: Optional[List[str]] = None) -> str:
-        """Build optimized context window."""
-        required_sections = required_sections or ['system', 'instructions']
+                    required_sections: Optional[List[str]] = None,
+                    return_cache_markers: bool = False,
+                    pre_counted_tokens: Optional[Dict[str, int]] = None) -> Union[str, Tuple[str, List[int]]]:
+        """Build optimized context window.
+        
+        With return_cache_markers, also returns the character offsets where
+        a provider cache breakpoint (e.g. Anthropic's cache_control) goes:
+        after the system section and after the last stable section.
+        pre_counted_tokens maps section names to token counts the caller
+        already has, which are used instead of tokenizing those sections.
+        """
+        pre_counted_tokens = pre_counted_tokens or {}
+        required_sections = frozenset(required_sections) if required_sections else _DEFAULT_REQUIRED_SECTIONS
         available_tokens = self.max_tokens - self.response_buffer
         
+        contents = {}
+        for name, content in sections.items():
+            content = _coerce_to_text(content)
+            contents[name] = _normalize_stable(content) if name in _STABLE_SECTIONS else content
+        
+        # Count every section not pre-counted in one batch tokenizer call
+        to_count = [name for name in contents if name not in pre_counted_tokens]
+        token_counts = dict(pre_counted_tokens)
+        token_counts.update(zip(to_count, self._count_tokens_batch([contents[name] for name in to_count])))
+        
         # Convert sections to WindowSection objects
         window_sections = []
-        for name, content in sections.items():
-            if isinstance(content, (list, dict)):
-                content = str(content)
-            
-            token_count = self.token_counter.count_tokens(content)
+        for name, content in contents.items():
+            token_count = token_counts[name]
             priority = self.section_priorities.get(name, 5)
             required = name in required_sections
             
@@ -69,19 +161,23 @@ class ContextWindow:
         optimized_sections = self._optimize_sections(window_sections, available_tokens)
         
         # Build final window
-        window_content = self._format_window(optimized_sections)
-        
-        final_tokens = self.token_counter.count_tokens(window_content)
+        # Counted from the sections as they are formatted, rather than
+        # retokenizing the whole window
+        window_content, cache_markers, final_tokens = self._format_window(optimized_sections)
         self.logger.info(f"Built context window: {final_tokens}/{available_tokens} tokens")
         
+        if return_cache_markers:
+            return window_content, cache_markers
         return window_content
     
     def _optimize_sections(self, sections: List[WindowSection], 
                           max_tokens: int) -> List[WindowSection]:
         """Optimize sections to fit within token limit."""
         # First, include all required sections
-        required_sections = [s for s in sections if s.required]
-        optional_sections = [s for s in sections if not s.required]
+        required_sections = []
+        optional_sections = []
+        for section in sections:
+            (required_sections if section.required else optional_sections).append(section)
         
         # Check if required sections fit
         required_tokens = sum(s.token_count for s in required_sections)
@@ -91,10 +187,18 @@ class ContextWindow:
             required_sections = self._truncate_sections(required_sections, max_tokens)
             return required_sections
         
-        # Add optional sections by priority
-        optional_sections.sort(key=lambda x: x.priority, reverse=True)
+        if self.strategy == 'density':
+            return self._pack_by_density(required_sections, optional_sections,
+                                         required_tokens, max_tokens)
         
-        selected_sections = required_sections.copy()
+        # Add optional sections by priority. The loop stops at the first one
+        # that doesn't fit, so at most budget // smallest section (+1 for the
+        # truncated tail) are ever looked at
+        smallest = min((s.token_count for s in optional_sections), default=0)
+        candidates = len(optional_sections) if smallest <= 0 else (max_tokens - required_tokens) // smallest + 1
+        optional_sections = heapq.nlargest(candidates, optional_sections, key=attrgetter('priority'))
+        
+        selected_sections = required_sections  # local list, extended in place
         current_tokens = required_tokens
         
         for section in optional_sections:
@@ -113,6 +217,30 @@ class ContextWindow:
         
         return selected_sections
     
+    def _pack_by_density(self, selected_sections: List[WindowSection],
+                         optional_sections: List[WindowSection],
+                         current_tokens: int, max_tokens: int) -> List[WindowSection]:
+        """Greedy knapsack: add optional sections by priority per token, skipping any that don't fit."""
+        optional_sections = sorted(optional_sections,
+                                   key=lambda s: s.priority / max(s.token_count, 1), reverse=True)
+        
+        skipped = None  # densest section that didn't fit
+        for section in optional_sections:
+            if current_tokens + section.token_count <= max_tokens:
+                selected_sections.append(section)
+                current_tokens += section.token_count
+            elif skipped is None:
+                skipped = section
+        
+        # Fill what's left with a truncated version of the densest leftover
+        remaining_tokens = max_tokens - current_tokens
+        if skipped is not None and remaining_tokens > 100:  # Minimum useful section size
+            truncated = self._truncate_section(skipped, remaining_tokens)
+            if truncated:
+                selected_sections.append(truncated)
+        
+        return selected_sections
+    
     def _truncate_sections(self, sections: List[WindowSection], 
                           max_tokens: int) -> List[WindowSection]:
         """Truncate sections to fit within token limit."""
@@ -142,36 +270,74 @@ class ContextWindow:
         if max_tokens < 50:  # Minimum useful size
             return None
         
-        # Use token counter to truncate
-        truncated_content = self.token_counter.truncate_to_limit(
-            section.content, buffer=0  # No buffer since we're managing it
-        )
-        
-        # Ensure we don't exceed the allocated tokens
-        while self.token_counter.count_tokens(truncated_content) > max_tokens:
-            # Further truncate by 10%
-            truncate_at = int(len(truncated_content) * 0.9)
-            truncated_content = truncated_content[:truncate_at]
+        truncated_content, token_count = self.token_counter.truncate_to_tokens(section.content, max_tokens)
         
         return WindowSection(
             name=f"{section.name}_truncated",
             content=truncated_content + "\n[...truncated...]" if len(truncated_content) < len(section.content) else truncated_content,
             priority=section.priority,
-            token_count=self.token_counter.count_tokens(truncated_content),
+            token_count=token_count,
             required=section.required
         )
     
-    def _format_window(self, sections: List[WindowSection]) -> str:
-        """Format sections into final context window."""
-        # Sort sections by priority for display
-        sections.sort(key=lambda x: x.priority, reverse=True)
-        
-        formatted_parts = []
+    def _format_window(self, sections: List[WindowSection]) -> Tuple[str, List[int], int]:
+        """Format sections into final context window in a single pass.
+        
+        Returns the window, its cache breakpoint offsets (after the system
+        section and at the end of the stable prefix) and its token count,
+        the section counts plus their headers.
+        """
+        stable_sections = []
+        dynamic_sections = []
         for section in sections:
-            header = f"=== {section.name.upper()} ==="
-            formatted_parts.append(f"{header}\n{section.content}\n")
+            (stable_sections if self._stable_rank(section) is not None else dynamic_sections).append(section)
+        
+        stable_sections.sort(key=self._stable_rank)
+        # Sort the remaining sections by priority for display
+        dynamic_sections.sort(key=lambda x: x.priority, reverse=True)
+        
+        breakpoints = set()
+        if stable_sections:
+            breakpoints.add(id(stable_sections[-1]))
+            if self._stable_rank(stable_sections[0]) == _STABLE_SECTIONS['system']:
+                breakpoints.add(id(stable_sections[0]))
         
-        return "\n".join(formatted_parts)
+        blocks = []
+        cache_markers = []
+        offset = -1  # no separator before the first block
+        total_tokens = 0
+        for section in chain(stable_sections, dynamic_sections):
+            block = self._format_section(section)
+            blocks.append(block)
+            offset += len(block) + 1
+            total_tokens += section.token_count + self._count_tokens(self._section_header(section))
+            if id(section) in breakpoints:
+                cache_markers.append(offset)
+        
+        return "\n".join(blocks), cache_markers, total_tokens
+    
+    def _format_section(self, section: WindowSection) -> str:
+        """Header and content block for a section, memoized on its name and content."""
+        key = (section.name, section.content)
+        block = self._section_blocks.get(key)
+        if block is not None:
+            self._section_blocks.move_to_end(key)
+            return block
+        
+        block = f"{self._section_header(section)}\n{section.content}\n"
+        self._section_blocks[key] = block
+        if len(self._section_blocks) > _SECTION_BLOCK_CACHE_SIZE:
+            self._section_blocks.popitem(last=False)
+        return block
+    
+    @staticmethod
+    def _stable_rank(section: WindowSection) -> Optional[int]:
+        """Position of a (possibly truncated) stable section in the prefix, None for the rest."""
+        return _STABLE_SECTIONS.get(section.name.removesuffix('_truncated'))
+    
+    @staticmethod
+    def _section_header(section: WindowSection) -> str:
+        return f"=== {section.name.upper()} ==="
     
     def estimate_context_items_fit(self, context_items: List[ContextItem], 
                                   reserved_tokens: int = 0) -> Tuple[List[ContextItem], int]:
@@ -181,7 +347,7 @@ class ContextWindow:
         # Sort by priority and recency
         sorted_items = sorted(
             context_items,
-            key=lambda x: (x.priority, x.timestamp.timestamp()),
+            key=attrgetter('_sort_key'),
             reverse=True
         )
         
@@ -202,6 +368,7 @@ class ContextWindow:
                                   max_history: int = 50) -> str:
         """Create context window optimized for conversation."""
         sections = {}
+        pre_counted = {}
         
         # System prompt
         if system_prompt:
@@ -212,19 +379,20 @@ class ContextWindow:
             # Take last N messages
             recent_messages = messages[-max_history:] if len(messages) > max_history else messages
             
-            conversation_text = ""
-            for msg in recent_messages:
-                role = msg.get('role', 'unknown')
-                content = msg.get('content', '')
-                conversation_text += f"{role.title()}: {content}\n\n"
+            message_texts = [f"{msg.get('role', 'unknown').title()}: {msg.get('content', '')}\n\n"
+                             for msg in recent_messages]
             
-            sections['recent_conversation'] = conversation_text
+            sections['recent_conversation'] = "".join(message_texts)
+            # Counted per message so each turn only tokenizes the new ones;
+            # earlier messages hit the token count cache
+            pre_counted['recent_conversation'] = sum(self._count_tokens_batch(message_texts))
         
-        return self.build_window(sections, required_sections=['system'])
+        return self.build_window(sections, required_sections=['system'],
+                                 pre_counted_tokens=pre_counted)
     
     def get_window_usage(self, content: str) -> Dict[str, Any]:
         """Get detailed window usage statistics."""
-        total_tokens = self.token_counter.count_tokens(content)
+        total_tokens = self._count_tokens(content)
         
         return {
             'total_tokens': total_tokens,
@@ -241,18 +409,15 @@ class ContextWindow:
         analysis = {}
         total_tokens = 0
         
-        for name, content in sections.items():
-            if isinstance(content, (list, dict)):
-                content = str(content)
-            
-            tokens = self.token_counter.count_tokens(content)
+        contents = [_coerce_to_text(content) for content in sections.values()]
+        for name, content, tokens in zip(sections, contents, self._count_tokens_batch(contents)):
             total_tokens += tokens
             
             analysis[name] = {
                 'tokens': tokens,
                 'priority': self.section_priorities.get(name, 5),
                 'length': len(content),
-                'required': name in ['system', 'instructions']
+                'required': name in _DEFAULT_REQUIRED_SECTIONS
             }
         
         # Add percentages
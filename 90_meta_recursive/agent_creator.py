@@ -14,19 +14,260 @@ Capabilities:
 
 import os
 import json
+import string
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from functools import cached_property, lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
 # Import the orchestrator to register new agents
 sys.path.append(str(Path(__file__).parent))
-from orchestrator import Agent, AgentOrchestrator
+from orchestrator import Agent, AgentOrchestrator, _atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Generated prompt and agent module; filled with string.Template.substitute,
+# so "$name"-style fields are the only placeholders
+_PROMPT_TEMPLATE = string.Template('''
+You are a specialized AI agent focused on $focus.
+
+**Your Core Mission:**
+$description
+
+**Your Expertise:**
+- Deep knowledge in $domain domain
+- Practical problem-solving skills
+- Ability to provide actionable insights and solutions
+
+**Your Response Style:**
+- Always provide specific, actionable recommendations
+- Use data-driven approaches when applicable
+- Explain your reasoning clearly
+- Offer multiple perspectives when appropriate
+
+**Key Principles:**
+1. Focus on practical, implementable solutions
+2. Provide clear step-by-step guidance
+3. Consider potential challenges and mitigation strategies
+4. Maintain accuracy and relevance to the $domain domain
+
+When responding to queries, always:
+- Start with a brief analysis of what you understand
+- Provide your main response with clear structure
+- End with suggested next steps or additional considerations
+
+Remember: You are designed to be the go-to expert for $focus. Leverage your specialized knowledge to provide maximum value.
+''')
+
+_AGENT_CODE_TEMPLATE = string.Template('''#!/usr/bin/env python3
+"""
+$name - Specialized Agent
+
+Domain: $domain
+Description: $description
+
+Capabilities: $capability_list
+
+Created: $created
+"""
+
+import importlib
+import logging
+from typing import Dict, List, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Integration requirements (pip name -> module), imported on first use via
+# _require() so loading the agent doesn't pay for packages it never touches
+INTEGRATION_MODULES = $integration_modules
+
+def _require(package: str):
+    """Import an integration requirement by its pip or module name"""
+    return importlib.import_module(INTEGRATION_MODULES.get(package, package))
+
+class $name:
+    """
+    Specialized agent for $domain domain tasks
+    """
+    
+    def __init__(self):
+        self.name = "$name"
+        self.domain = "$domain"
+        self.capabilities = $capabilities
+        self.prompt_template = """$prompt_template"""
+        
+        logger.info(f"Initialized {self.name} agent")
+    
+    def process_request(self, request: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Main entry point for processing requests
+        """
+        logger.info(f"Processing request: {request[:100]}...")
+        
+        try:
+            # Apply specialized prompt template
+            enhanced_prompt = self._enhance_prompt(request, context)
+            
+            # Process with specialized capabilities
+            result = self._process_with_capabilities(enhanced_prompt, context)
+            
+            return {
+                'status': 'success',
+                'result': result,
+                'agent': self.name,
+                'domain': self.domain
+            }
+        
+        except Exception as e:
+            logger.error(f"Error processing request: {e}")
+            return {
+                'status': 'error',
+                'error': str(e),
+                'agent': self.name
+            }
+    
+    def _enhance_prompt(self, request: str, context: Dict[str, Any] = None) -> str:
+        """
+        Enhance the request with domain-specific context and prompt template
+        """
+        enhanced = f"{self.prompt_template}\\n\\nUser Request: {request}"
+        
+        if context:
+            context_str = "\\n".join([f"{k}: {v}" for k, v in context.items()])
+            enhanced += f"\\n\\nAdditional Context:\\n{context_str}"
+        
+        return enhanced
+    
+    def _process_with_capabilities(self, prompt: str, context: Dict[str, Any] = None) -> str:
+        """
+        Process the request using specialized capabilities
+        """
+        # This would integrate with your preferred LLM API
+        # For now, return a structured response
+        
+        return f"Processed request using {self.name} capabilities: {', '.join(self.capabilities)}"
+    
+    def get_capabilities(self) -> List[str]:
+        """Return list of agent capabilities"""
+        return self.capabilities
+    
+    def get_metadata(self) -> Dict[str, Any]:
+        """Return agent metadata"""
+        return {
+            'name': self.name,
+            'domain': self.domain,
+            'capabilities': self.capabilities,
+            'description': "$description"
+        }
+
+def main():
+    """CLI interface for the agent"""
+    import argparse
+    import json
+    
+    parser = argparse.ArgumentParser(description='$name')
+    parser.add_argument('request', help='Request to process')
+    parser.add_argument('--context', help='Additional context (JSON string)')
+    
+    args = parser.parse_args()
+    
+    agent = $name()
+    
+    context = None
+    if args.context:
+        try:
+            context = json.loads(args.context)
+        except json.JSONDecodeError:
+            print("Error: Invalid JSON in context argument")
+            sys.exit(1)
+    
+    result = agent.process_request(args.request, context)
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
+''')
+
+# Template requirements whose import name differs from the pip package name
+_MODULE_NAMES = {
+    'scikit-learn': 'sklearn',
+    'beautifulsoup4': 'bs4',
+    'pillow': 'PIL'
+}
+
+# Agent templates for each domain, shared by every AgentCreator
+_DOMAIN_TEMPLATES = {
+    'data': {
+        'capabilities': ('data_analysis', 'statistics', 'visualization', 'cleaning', 'modeling'),
+        'imports': ('pandas', 'numpy', 'matplotlib', 'seaborn', 'scikit-learn'),
+        'prompt_focus': 'data analysis and statistical insights',
+        'specialized_functions': ('analyze_dataset', 'create_visualization', 'statistical_summary', 'data_quality_check')
+    },
+    'finance': {
+        'capabilities': ('financial_analysis', 'budgeting', 'forecasting', 'risk_assessment'),
+        'imports': ('pandas', 'numpy', 'yfinance', 'scipy'),
+        'prompt_focus': 'financial analysis and investment insights',
+        'specialized_functions': ('calculate_metrics', 'risk_analysis', 'portfolio_optimization', 'financial_forecasting')
+    },
+    'web': {
+        'capabilities': ('web_development', 'html_css', 'javascript', 'responsive_design'),
+        'imports': ('requests', 'beautifulsoup4', 'selenium'),
+        'prompt_focus': 'web development and frontend design',
+        'specialized_functions': ('generate_html', 'create_css', 'web_scraping', 'validate_markup')
+    },
+    'ml': {
+        'capabilities': ('machine_learning', 'model_training', 'prediction', 'feature_engineering'),
+        'imports': ('scikit-learn', 'tensorflow', 'pandas', 'numpy'),
+        'prompt_focus': 'machine learning and predictive modeling',
+        'specialized_functions': ('train_model', 'evaluate_model', 'feature_selection', 'hyperparameter_tuning')
+    },
+    'research': {
+        'capabilities': ('research', 'analysis', 'summarization', 'citation'),
+        'imports': ('requests', 'beautifulsoup4', 'scholarly'),
+        'prompt_focus': 'research and academic analysis',
+        'specialized_functions': ('literature_review', 'summarize_papers', 'citation_analysis', 'research_synthesis')
+    },
+    'creative': {
+        'capabilities': ('content_creation', 'writing', 'design', 'brainstorming'),
+        'imports': ('openai', 'pillow', 'requests'),
+        'prompt_focus': 'creative content and design',
+        'specialized_functions': ('generate_content', 'brainstorm_ideas', 'creative_writing', 'design_concepts')
+    },
+    'automation': {
+        'capabilities': ('workflow_automation', 'scripting', 'integration', 'monitoring'),
+        'imports': ('requests', 'schedule', 'subprocess', 'psutil'),
+        'prompt_focus': 'automation and workflow optimization',
+        'specialized_functions': ('automate_task', 'monitor_system', 'integrate_apis', 'schedule_jobs')
+    }
+}
+
+# Domain detection keywords; the first domain with a keyword in the
+# description wins
+_DOMAIN_KEYWORDS = {
+    'data': ('data', 'dataset', 'analysis', 'statistics', 'analytics'),
+    'finance': ('financial', 'finance', 'money', 'budget', 'investment', 'stock'),
+    'web': ('website', 'web', 'html', 'css', 'frontend', 'backend'),
+    'ml': ('machine learning', 'ai', 'model', 'prediction', 'neural'),
+    'research': ('research', 'study', 'academic', 'paper', 'analysis'),
+    'creative': ('creative', 'design', 'content', 'writing', 'art'),
+    'automation': ('automate', 'script', 'workflow', 'process', 'integration')
+}
+
+# Flattened to (keyword, domain) pairs in domain order, so one scan returns
+# the same domain as checking domain by domain
+_DOMAIN_KEYWORD_SCAN = tuple((keyword, domain)
+                             for domain, keywords in _DOMAIN_KEYWORDS.items()
+                             for keyword in keywords)
+
+
+@lru_cache(maxsize=64)
+def _render_prompt_template(description: str, domain: str, focus: str) -> str:
+    """Prompt text for the given inputs; identical inputs give identical prompts"""
+    return _PROMPT_TEMPLATE.substitute(description=description, domain=domain, focus=focus).strip()
+
 @dataclass
 class AgentSpec:
     """Specification for creating a new agent"""
@@ -44,8 +285,11 @@ class AgentCreator:
     Meta-agent that creates specialized agents based on requirements
     """
     
-    def __init__(self, base_path: str = None):
+    def __init__(self, base_path: str = None, orchestrator: Optional[AgentOrchestrator] = None):
         self.base_path = Path(base_path) if base_path else Path(__file__).parent.parent
+        if orchestrator is not None:
+            # Share the caller's orchestrator so routing sees new agents at once
+            self.orchestrator = orchestrator
         self.agents_path = self.base_path / "70_agents"
         self.templates_path = self.base_path / "20_templates"
         
@@ -54,54 +298,14 @@ class AgentCreator:
         
         logger.info("Agent Creator initialized")
     
+    @cached_property
+    def orchestrator(self) -> AgentOrchestrator:
+        """Orchestrator used to register created agents, loaded from the registry once"""
+        return AgentOrchestrator(self.base_path)
+    
     def load_domain_templates(self) -> Dict[str, Dict]:
         """Load agent templates for different domains"""
-        templates = {
-            'data': {
-                'capabilities': ['data_analysis', 'statistics', 'visualization', 'cleaning', 'modeling'],
-                'imports': ['pandas', 'numpy', 'matplotlib', 'seaborn', 'scikit-learn'],
-                'prompt_focus': 'data analysis and statistical insights',
-                'specialized_functions': ['analyze_dataset', 'create_visualization', 'statistical_summary', 'data_quality_check']
-            },
-            'finance': {
-                'capabilities': ['financial_analysis', 'budgeting', 'forecasting', 'risk_assessment'],
-                'imports': ['pandas', 'numpy', 'yfinance', 'scipy'],
-                'prompt_focus': 'financial analysis and investment insights',
-                'specialized_functions': ['calculate_metrics', 'risk_analysis', 'portfolio_optimization', 'financial_forecasting']
-            },
-            'web': {
-                'capabilities': ['web_development', 'html_css', 'javascript', 'responsive_design'],
-                'imports': ['requests', 'beautifulsoup4', 'selenium'],
-                'prompt_focus': 'web development and frontend design',
-                'specialized_functions': ['generate_html', 'create_css', 'web_scraping', 'validate_markup']
-            },
-            'ml': {
-                'capabilities': ['machine_learning', 'model_training', 'prediction', 'feature_engineering'],
-                'imports': ['scikit-learn', 'tensorflow', 'pandas', 'numpy'],
-                'prompt_focus': 'machine learning and predictive modeling',
-                'specialized_functions': ['train_model', 'evaluate_model', 'feature_selection', 'hyperparameter_tuning']
-            },
-            'research': {
-                'capabilities': ['research', 'analysis', 'summarization', 'citation'],
-                'imports': ['requests', 'beautifulsoup4', 'scholarly'],
-                'prompt_focus': 'research and academic analysis',
-                'specialized_functions': ['literature_review', 'summarize_papers', 'citation_analysis', 'research_synthesis']
-            },
-            'creative': {
-                'capabilities': ['content_creation', 'writing', 'design', 'brainstorming'],
-                'imports': ['openai', 'pillow', 'requests'],
-                'prompt_focus': 'creative content and design',
-                'specialized_functions': ['generate_content', 'brainstorm_ideas', 'creative_writing', 'design_concepts']
-            },
-            'automation': {
-                'capabilities': ['workflow_automation', 'scripting', 'integration', 'monitoring'],
-                'imports': ['requests', 'schedule', 'subprocess', 'psutil'],
-                'prompt_focus': 'automation and workflow optimization',
-                'specialized_functions': ['automate_task', 'monitor_system', 'integrate_apis', 'schedule_jobs']
-            }
-        }
-        
-        return templates
+        return _DOMAIN_TEMPLATES
     
     def analyze_requirements(self, description: str, domain: str = None) -> AgentSpec:
         """
@@ -135,7 +339,7 @@ class AgentCreator:
             capabilities=capabilities,
             prompt_template=prompt_template,
             specialized_functions=specialized_functions,
-            integration_requirements=template['imports'],
+            integration_requirements=list(template['imports']),
             performance_metrics=['accuracy', 'response_time', 'user_satisfaction']
         )
         
@@ -145,18 +349,8 @@ class AgentCreator:
         """Auto-detect domain based on description"""
         text_lower = description.lower()
         
-        domain_keywords = {
-            'data': ['data', 'dataset', 'analysis', 'statistics', 'analytics'],
-            'finance': ['financial', 'finance', 'money', 'budget', 'investment', 'stock'],
-            'web': ['website', 'web', 'html', 'css', 'frontend', 'backend'],
-            'ml': ['machine learning', 'ai', 'model', 'prediction', 'neural'],
-            'research': ['research', 'study', 'academic', 'paper', 'analysis'],
-            'creative': ['creative', 'design', 'content', 'writing', 'art'],
-            'automation': ['automate', 'script', 'workflow', 'process', 'integration']
-        }
-        
-        for domain, keywords in domain_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for keyword, domain in _DOMAIN_KEYWORD_SCAN:
+            if keyword in text_lower:
                 return domain
         
         return 'research'  # Default domain
@@ -175,42 +369,36 @@ class AgentCreator:
     
     def generate_prompt_template(self, description: str, domain: str, focus: str) -> str:
         """Generate a specialized prompt template"""
-        template = f'''
-You are a specialized AI agent focused on {focus}.
-
-**Your Core Mission:**
-{description}
-
-**Your Expertise:**
-- Deep knowledge in {domain} domain
-- Practical problem-solving skills
-- Ability to provide actionable insights and solutions
-
-**Your Response Style:**
-- Always provide specific, actionable recommendations
-- Use data-driven approaches when applicable
-- Explain your reasoning clearly
-- Offer multiple perspectives when appropriate
-
-**Key Principles:**
-1. Focus on practical, implementable solutions
-2. Provide clear step-by-step guidance
-3. Consider potential challenges and mitigation strategies
-4. Maintain accuracy and relevance to the {domain} domain
-
-When responding to queries, always:
-- Start with a brief analysis of what you understand
-- Provide your main response with clear structure
-- End with suggested next steps or additional considerations
-
-Remember: You are designed to be the go-to expert for {focus}. Leverage your specialized knowledge to provide maximum value.
-'''
-        return template.strip()
+        return _render_prompt_template(description, domain, focus)
     
     def create_agent(self, description: str, domain: str = None, output_dir: str = None) -> Dict[str, Any]:
         """
         Create a complete specialized agent based on requirements
         """
+        agent, result = self._build_agent(description, domain, output_dir)
+        self.orchestrator.register_agent(agent)
+        
+        logger.info(f"Successfully created agent: {agent.name}")
+        return result
+    
+    def create_agents_batch(self, specs: List[Tuple[str, Optional[str]]],
+                            atomic_writes: bool = False) -> List[Dict[str, Any]]:
+        """
+        Create several agents from (description, domain) pairs, registering them in one registry write.
+        With atomic_writes, each agent file is written to a temp file and moved into place.
+        """
+        built = [self._build_agent(description, domain, atomic_write=atomic_writes)
+                 for description, domain in specs]
+        self.orchestrator.register_agents([agent for agent, _ in built])
+        
+        logger.info(f"Successfully created {len(built)} agents")
+        return [result for _, result in built]
+    
+    def _build_agent(self, description: str, domain: str = None, output_dir: str = None,
+                     atomic_write: bool = False) -> Tuple[Agent, Dict[str, Any]]:
+        """
+        Generate and write an agent's code, returning its registry entry and the creation result
+        """
         logger.info(f"Creating agent for: {description[:100]}...")
         
         # Generate agent specification
@@ -229,11 +417,12 @@ Remember: You are designed to be the go-to expert for {focus}. Leverage your spe
         
         # Write agent file
         agent_file = output_dir / f"{spec.name.lower()}.py"
-        with open(agent_file, 'w') as f:
-            f.write(agent_code)
+        if atomic_write:
+            _atomic_write(agent_file, 'w', lambda f: f.write(agent_code), encoding='utf-8')
+        else:
+            agent_file.write_text(agent_code, encoding='utf-8')
         
-        # Register agent with orchestrator
-        orchestrator = AgentOrchestrator(self.base_path)
+        # Registry entry for the orchestrator
         agent = Agent(
             name=spec.name,
             type="specialized",
@@ -246,8 +435,6 @@ Remember: You are designed to be the go-to expert for {focus}. Leverage your spe
             file_path=str(agent_file)
         )
         
-        orchestrator.register_agent(agent)
-        
         result = {
             'status': 'success',
             'agent_name': spec.name,
@@ -257,134 +444,23 @@ Remember: You are designed to be the go-to expert for {focus}. Leverage your spe
             'description': spec.description
         }
         
-        logger.info(f"Successfully created agent: {spec.name}")
-        return result
+        return agent, result
     
     def create_agent_code(self, spec: AgentSpec) -> str:
         """Generate the Python code for the specialized agent"""
         
-        imports = '\n'.join([f"import {pkg}" for pkg in spec.integration_requirements])
+        integration_modules = {pkg: _MODULE_NAMES.get(pkg, pkg) for pkg in spec.integration_requirements}
         
-        agent_code = f'''#!/usr/bin/env python3
-"""
-{spec.name} - Specialized Agent
-
-Domain: {spec.domain}
-Description: {spec.description}
-
-Capabilities: {', '.join(spec.capabilities)}
-
-Created: {datetime.now().isoformat()}
-"""
-
-{imports}
-import logging
-from typing import Dict, List, Any, Optional
-
-logger = logging.getLogger(__name__)
-
-class {spec.name}:
-    """
-    Specialized agent for {spec.domain} domain tasks
-    """
-    
-    def __init__(self):
-        self.name = "{spec.name}"
-        self.domain = "{spec.domain}"
-        self.capabilities = {spec.capabilities}
-        self.prompt_template = """{spec.prompt_template}"""
-        
-        logger.info(f"Initialized {{self.name}} agent")
-    
-    def process_request(self, request: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
-        """
-        Main entry point for processing requests
-        """
-        logger.info(f"Processing request: {{request[:100]}}...")
-        
-        try:
-            # Apply specialized prompt template
-            enhanced_prompt = self._enhance_prompt(request, context)
-            
-            # Process with specialized capabilities
-            result = self._process_with_capabilities(enhanced_prompt, context)
-            
-            return {{
-                'status': 'success',
-                'result': result,
-                'agent': self.name,
-                'domain': self.domain
-            }}
-        
-        except Exception as e:
-            logger.error(f"Error processing request: {{e}}")
-            return {{
-                'status': 'error',
-                'error': str(e),
-                'agent': self.name
-            }}
-    
-    def _enhance_prompt(self, request: str, context: Dict[str, Any] = None) -> str:
-        """
-        Enhance the request with domain-specific context and prompt template
-        """
-        enhanced = f"{{self.prompt_template}}\\n\\nUser Request: {{request}}"
-        
-        if context:
-            context_str = "\\n".join([f"{{k}}: {{v}}" for k, v in context.items()])
-            enhanced += f"\\n\\nAdditional Context:\\n{{context_str}}"
-        
-        return enhanced
-    
-    def _process_with_capabilities(self, prompt: str, context: Dict[str, Any] = None) -> str:
-        """
-        Process the request using specialized capabilities
-        """
-        # This would integrate with your preferred LLM API
-        # For now, return a structured response
-        
-        return f"Processed request using {{self.name}} capabilities: {{', '.join(self.capabilities)}}"
-    
-    def get_capabilities(self) -> List[str]:
-        """Return list of agent capabilities"""
-        return self.capabilities
-    
-    def get_metadata(self) -> Dict[str, Any]:
-        """Return agent metadata"""
-        return {{
-            'name': self.name,
-            'domain': self.domain,
-            'capabilities': self.capabilities,
-            'description': "{spec.description}"
-        }}
-
-def main():
-    """CLI interface for the agent"""
-    import argparse
-    import json
-    
-    parser = argparse.ArgumentParser(description='{spec.name}')
-    parser.add_argument('request', help='Request to process')
-    parser.add_argument('--context', help='Additional context (JSON string)')
-    
-    args = parser.parse_args()
-    
-    agent = {spec.name}()
-    
-    context = None
-    if args.context:
-        try:
-            context = json.loads(args.context)
-        except json.JSONDecodeError:
-            print("Error: Invalid JSON in context argument")
-            sys.exit(1)
-    
-    result = agent.process_request(args.request, context)
-    print(json.dumps(result, indent=2))
-
-if __name__ == "__main__":
-    main()
-'''
+        agent_code = _AGENT_CODE_TEMPLATE.substitute(
+            name=spec.name,
+            domain=spec.domain,
+            description=spec.description,
+            capability_list=', '.join(spec.capabilities),
+            capabilities=spec.capabilities,
+            prompt_template=spec.prompt_template,
+            integration_modules=integration_modules,
+            created=datetime.now().isoformat()
+        )
         
         return agent_code
 
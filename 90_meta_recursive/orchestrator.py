@@ -12,16 +12,35 @@ Core Capabilities:
 - Performance monitoring and optimization
 """
 
+import atexit
 import json
+import math
+import mmap
 import os
 import sys
+import time
 import importlib.util
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
 import logging
 
+try:
+    import orjson as _orjson
+except ImportError:  # registry I/O falls back to the stdlib json module
+    _orjson = None
+
+try:
+    import numpy as _np
+except ImportError:  # find_best_agent scores agents in a Python loop instead
+    _np = None
+
+# The temp-file-and-rename writer is shared with the core utilities
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+_atomic_write = importlib.import_module('10_core_utils.file_handler')._atomic_write
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,7 +52,50 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Per-route messages are DEBUG; CE_LOG_LEVEL sets how much this module emits
+try:
+    logger.setLevel(os.environ.get('CE_LOG_LEVEL', 'WARNING').upper())
+except ValueError:
+    logger.setLevel(logging.WARNING)
+
+# Below this many agents the Python scoring loop beats building score arrays
+_NUMPY_MIN_AGENTS = 64
+_RECENT_USE_SECONDS = 7 * 24 * 3600
+
+# Orchestrators with routing updates not yet saved. Held strongly so the
+# updates still reach disk at exit if the caller drops the instance; an
+# orchestrator leaves the set as soon as it saves
+_unsaved_orchestrators = set()
+
+@atexit.register
+def _flush_unsaved_orchestrators():
+    for orchestrator in list(_unsaved_orchestrators):
+        orchestrator.flush()
+
+_DOMAIN_KEYWORDS = {
+    'data': ('data', 'analysis', 'analytics', 'statistics', 'dataset'),
+    'finance': ('financial', 'finance', 'money', 'budget', 'investment'),
+    'web': ('website', 'web', 'html', 'css', 'frontend', 'backend'),
+    'ml': ('machine learning', 'ai', 'model', 'training', 'prediction'),
+    'research': ('research', 'study', 'analyze', 'investigate'),
+    'creative': ('creative', 'design', 'art', 'content', 'writing'),
+    'automation': ('automate', 'script', 'workflow', 'process')
+}
+
+# Flattened to (keyword, domain) pairs in domain order, so one scan returns
+# the same domain as checking domain by domain
+_DOMAIN_KEYWORD_SCAN = tuple((keyword, domain)
+                             for domain, keywords in _DOMAIN_KEYWORDS.items()
+                             for keyword in keywords)
+
+def _last_used_epoch(last_used: str) -> float:
+    """Epoch seconds for an ISO last_used stamp, 0.0 (never) when it doesn't parse"""
+    try:
+        return datetime.fromisoformat(last_used).timestamp()
+    except (TypeError, ValueError, OverflowError, OSError):
+        return 0.0
+
+@dataclass(slots=True)
 class Agent:
     """Agent metadata and capabilities"""
     name: str
@@ -45,15 +107,29 @@ class Agent:
     last_used: str
     usage_count: int
     file_path: str
+    last_used_epoch: float = 0.0
+    _caps_lower: Tuple[str, ...] = field(default=(), init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if not self.last_used_epoch:
+            # Registries written before last_used_epoch existed only have the ISO stamp
+            self.last_used_epoch = _last_used_epoch(self.last_used)
+        # Interned so find_best_agent's domain checks are mostly identity compares
+        if isinstance(self.domain, str):
+            self.domain = sys.intern(self.domain)
+        # Capabilities don't change after registration; lowercase them once for scoring
+        self._caps_lower = tuple(sys.intern(cap.lower()) for cap in self.capabilities)
     
     def to_dict(self) -> Dict:
-        return asdict(self)
+        data = asdict(self)
+        del data['_caps_lower']
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Agent':
         return cls(**data)
 
-@dataclass
+@dataclass(slots=True)
 class Problem:
     """Problem definition for routing"""
     description: str
@@ -63,19 +139,61 @@ class Problem:
     requirements: Optional[List[str]] = None
     context: Optional[Dict[str, Any]] = None
 
+def _json_default(obj: Any) -> Any:
+    """Stdlib json fallback for routing results, which hold Agent and Problem instances"""
+    if isinstance(obj, Agent):
+        return obj.to_dict()
+    if isinstance(obj, Problem):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class _AgentColumns:
+    """Registry agents as parallel arrays, so find_best_agent scores them in a few numpy ops"""
+    
+    def __init__(self, agents: List[Agent]):
+        self.agents = agents
+        self.index = {agent.name: i for i, agent in enumerate(agents)}
+        self.domains = _np.array([agent.domain for agent in agents], dtype=object)
+        self.performance = _np.array([agent.performance_score for agent in agents], dtype=_np.float64)
+        self.last_used = _np.array([agent.last_used_epoch for agent in agents], dtype=_np.float64)
+        self.capabilities = [agent._caps_lower for agent in agents]
+    
+    def scores(self, problem: Problem):
+        scores = _np.zeros(len(self.agents))
+        if problem.domain:
+            scores += (self.domains == problem.domain) * 10
+        if problem.requirements:
+            requirements = [req.lower() for req in problem.requirements]
+            scores += _np.fromiter(
+                (sum(1 for req in requirements if any(cap in req for cap in caps)) * 5
+                 for caps in self.capabilities),
+                dtype=_np.float64, count=len(self.agents))
+        scores += self.performance
+        scores += (time.time() - self.last_used < _RECENT_USE_SECONDS) * 2
+        return scores
+
 class AgentOrchestrator:
     """
     Central orchestrator for managing the agent ecosystem
     """
     
-    def __init__(self, base_path: str = None):
+    def __init__(self, base_path: str = None, flush_interval: float = 5.0):
         self.base_path = Path(base_path) if base_path else Path(__file__).parent.parent
         self.agents_path = self.base_path / "70_agents"
         self.templates_path = self.base_path / "20_templates"
         self.meta_path = self.base_path / "90_meta_recursive"
+        self._registry_file = self.agents_path / "agent_registry.json"
+        self._agents_dir_created = False
+        
+        # Usage updates from routing only mark the registry dirty; it is
+        # written at most once per flush_interval seconds and at exit
+        self.flush_interval = flush_interval
+        self._dirty = False
+        self._last_flush = time.monotonic()
         
         # Agent registry
         self.agents_registry = {}
+        self._columns = None  # _AgentColumns, rebuilt after the registry changes
         self.load_agent_registry()
         
         logger.info(f"Orchestrator initialized with base path: {self.base_path}")
@@ -83,36 +201,138 @@ class AgentOrchestrator:
     
     def load_agent_registry(self):
         """Load existing agents from registry file"""
-        registry_file = self.agents_path / "agent_registry.json"
+        self._columns = None
+        # Changes made here since the last save, applied on top of whatever
+        # the file holds by then (see _merge_with_file)
+        self._pending_usage = {}
+        self._pending_agents = set()
+        registry_file = self._registry_file
         if registry_file.exists():
             try:
-                with open(registry_file, 'r') as f:
-                    data = json.load(f)
-                    self.agents_registry = {
-                        name: Agent.from_dict(agent_data) 
-                        for name, agent_data in data.items()
-                    }
+                self.agents_registry = self._read_registry()
             except Exception as e:
                 logger.error(f"Error loading agent registry: {e}")
                 self.agents_registry = {}
         else:
             self.agents_registry = {}
             self.save_agent_registry()
+        self._recount_ecosystem()
+    
+    def _read_registry(self) -> Dict[str, Agent]:
+        """Agents currently in the registry file; raises if it can't be parsed"""
+        with open(self._registry_file, 'rb') as f:
+            if _orjson is not None and os.fstat(f.fileno()).st_size:
+                # Parse straight from the mapped pages instead of copying the file
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    data = _orjson.loads(view)
+            else:
+                raw = f.read()
+                data = _orjson.loads(raw) if _orjson is not None else json.loads(raw)
+        return {
+            name: Agent.from_dict(agent_data) 
+            for name, agent_data in data.items()
+        }
+    
+    def _merge_with_file(self) -> Dict[str, Agent]:
+        """The registry to save: the file's agents with this instance's changes applied
+        
+        Another orchestrator (an AgentCreator's, another process) may have
+        saved since this one loaded. Its agents and usage are kept: only
+        agents registered here replace the file's copy, and routing adds its
+        usage counts to the file's.
+        """
+        try:
+            on_disk = self._read_registry() if self._registry_file.exists() else {}
+        except Exception as e:
+            logger.warning(f"Overwriting unreadable agent registry: {e}")
+            on_disk = {}
+        if not on_disk:
+            return self.agents_registry
+        
+        merged = dict(on_disk)
+        for name, agent in self.agents_registry.items():
+            stored = on_disk.get(name)
+            if stored is None or name in self._pending_agents:
+                merged[name] = agent
+            elif name in self._pending_usage:
+                agent.usage_count = stored.usage_count + self._pending_usage[name]
+                if stored.last_used_epoch > agent.last_used_epoch:
+                    agent.last_used = stored.last_used
+                    agent.last_used_epoch = stored.last_used_epoch
+                merged[name] = agent
+        return merged
+    
+    def _recount_ecosystem(self):
+        """Rebuild the running totals get_ecosystem_status reports"""
+        self._domain_counts = Counter()
+        self._total_usage = 0
+        self._perf_sum = 0
+        for agent in self.agents_registry.values():
+            self._count_agent(agent)
+    
+    def _count_agent(self, agent: Agent):
+        self._domain_counts[agent.domain] += 1
+        self._total_usage += agent.usage_count
+        self._perf_sum += agent.performance_score
+    
+    def _add_to_registry(self, agent: Agent):
+        replaced = agent.name in self.agents_registry
+        self.agents_registry[agent.name] = agent
+        self._pending_agents.add(agent.name)
+        self._columns = None
+        if replaced:
+            self._recount_ecosystem()
+        else:
+            self._count_agent(agent)
     
     def save_agent_registry(self):
         """Save agent registry to file"""
-        registry_file = self.agents_path / "agent_registry.json"
-        registry_file.parent.mkdir(exist_ok=True)
+        registry_file = self._registry_file
+        if not self._agents_dir_created:
+            registry_file.parent.mkdir(exist_ok=True)
+            self._agents_dir_created = True
         
         try:
-            with open(registry_file, 'w') as f:
-                registry_data = {
-                    name: agent.to_dict() 
-                    for name, agent in self.agents_registry.items()
-                }
-                json.dump(registry_data, f, indent=2)
+            merged = self._merge_with_file()
+            registry_data = {
+                name: agent.to_dict() 
+                for name, agent in merged.items()
+            }
+            if _orjson is not None:
+                payload = _orjson.dumps(registry_data, option=_orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(registry_data, indent=2).encode()
+            self._write_registry(payload)
         except Exception as e:
             logger.error(f"Error saving agent registry: {e}")
+            return
+        
+        if merged is not self.agents_registry:
+            self.agents_registry = merged
+            self._columns = None
+            self._recount_ecosystem()
+        self._pending_usage.clear()
+        self._pending_agents.clear()
+        self._dirty = False
+        _unsaved_orchestrators.discard(self)
+        self._last_flush = time.monotonic()
+    
+    def _write_registry(self, payload: bytes):
+        """Write the registry to a temp file beside it, then move it into place
+        
+        A crash mid-write leaves the previous registry intact instead of a
+        truncated file that fails to load.
+        """
+        _atomic_write(self._registry_file, 'wb', lambda f: f.write(payload))
+    
+    def flush(self):
+        """Save the registry if routing has changed it since the last save"""
+        if self._dirty:
+            self.save_agent_registry()
+    
+    def _maybe_flush(self):
+        if self._dirty and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.save_agent_registry()
     
     def analyze_problem(self, problem_description: str) -> Problem:
         """
@@ -124,19 +344,9 @@ class AgentOrchestrator:
         problem = Problem(description=problem_description)
         
         # Simple domain detection based on keywords
-        domains = {
-            'data': ['data', 'analysis', 'analytics', 'statistics', 'dataset'],
-            'finance': ['financial', 'finance', 'money', 'budget', 'investment'],
-            'web': ['website', 'web', 'html', 'css', 'frontend', 'backend'],
-            'ml': ['machine learning', 'ai', 'model', 'training', 'prediction'],
-            'research': ['research', 'study', 'analyze', 'investigate'],
-            'creative': ['creative', 'design', 'art', 'content', 'writing'],
-            'automation': ['automate', 'script', 'workflow', 'process']
-        }
-        
         text_lower = problem_description.lower()
-        for domain, keywords in domains.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for keyword, domain in _DOMAIN_KEYWORD_SCAN:
+            if keyword in text_lower:
                 problem.domain = domain
                 break
         
@@ -148,7 +358,7 @@ class AgentOrchestrator:
         else:
             problem.complexity = 'low'
         
-        logger.info(f"Analyzed problem - Domain: {problem.domain}, Complexity: {problem.complexity}")
+        logger.debug("Analyzed problem - Domain: %s, Complexity: %s", problem.domain, problem.complexity)
         return problem
     
     def find_best_agent(self, problem: Problem) -> Optional[Agent]:
@@ -159,21 +369,33 @@ class AgentOrchestrator:
             logger.warning("No agents available in registry")
             return None
         
-        # Score agents based on problem requirements
-        scored_agents = []
+        if _np is not None and len(self.agents_registry) >= _NUMPY_MIN_AGENTS:
+            columns = self._agent_columns()
+            best_agent = columns.agents[int(_np.argmax(columns.scores(problem)))]
+            logger.debug("Selected agent: %s (domain: %s)", best_agent.name, best_agent.domain)
+            return best_agent
+        
+        # Score agents based on problem requirements, keeping the first best
+        domain = problem.domain
+        if isinstance(domain, str):
+            domain = sys.intern(domain)
+        best_agent = None
+        best_score = -math.inf
+        requirements = [req.lower() for req in problem.requirements] if problem.requirements else None
+        now = time.time()
         
         for agent in self.agents_registry.values():
             score = 0
             
             # Domain match
-            if problem.domain and agent.domain == problem.domain:
+            if domain and agent.domain == domain:
                 score += 10
             
             # Capability match
-            if problem.requirements:
+            if requirements:
                 capability_matches = sum(
-                    1 for req in problem.requirements 
-                    if any(cap in req.lower() for cap in agent.capabilities)
+                    1 for req in requirements
+                    if any(cap in req for cap in agent._caps_lower)
                 )
                 score += capability_matches * 5
             
@@ -181,28 +403,47 @@ class AgentOrchestrator:
             score += agent.performance_score
             
             # Prefer recently used agents (they're "warmed up")
-            try:
-                last_used = datetime.fromisoformat(agent.last_used)
-                days_since_use = (datetime.now() - last_used).days
-                if days_since_use < 7:
-                    score += 2
-            except:
-                pass
+            if now - agent.last_used_epoch < _RECENT_USE_SECONDS:
+                score += 2
             
-            scored_agents.append((score, agent))
+            if score > best_score:
+                best_score, best_agent = score, agent
         
-        if scored_agents:
-            best_agent = max(scored_agents, key=lambda x: x[0])[1]
-            logger.info(f"Selected agent: {best_agent.name} (domain: {best_agent.domain})")
+        if best_agent is not None:
+            logger.debug("Selected agent: %s (domain: %s)", best_agent.name, best_agent.domain)
             return best_agent
         
         return None
     
+    def _agent_columns(self) -> _AgentColumns:
+        columns = self._columns
+        if columns is None or len(columns.agents) != len(self.agents_registry):
+            columns = self._columns = _AgentColumns(list(self.agents_registry.values()))
+        return columns
+    
     def route_problem(self, problem_description: str) -> Dict[str, Any]:
         """
         Route a problem to the most appropriate agent
+        
+        The result holds the live Agent and Problem instances; serialize it
+        with orjson or json.dumps(..., default=_json_default).
+        """
+        result = self._route(problem_description)
+        self._maybe_flush()
+        return result
+    
+    def route_problems(self, problem_descriptions: List[str]) -> List[Dict[str, Any]]:
         """
-        logger.info(f"Routing problem: {problem_description[:100]}...")
+        Route several problems in order, saving the registry once at the end
+        """
+        results = [self._route(description) for description in problem_descriptions]
+        if self._dirty:
+            self.save_agent_registry()
+        return results
+    
+    def _route(self, problem_description: str) -> Dict[str, Any]:
+        """Route one problem, leaving the registry save to the caller"""
+        logger.debug("Routing problem: %.100s...", problem_description)
         
         # Analyze the problem
         problem = self.analyze_problem(problem_description)
@@ -212,31 +453,45 @@ class AgentOrchestrator:
         
         if best_agent:
             # Update agent usage statistics
-            best_agent.last_used = datetime.now().isoformat()
+            now = time.time()
+            best_agent.last_used = datetime.fromtimestamp(now).isoformat()
+            best_agent.last_used_epoch = now
             best_agent.usage_count += 1
-            self.save_agent_registry()
+            self._total_usage += 1
+            self._pending_usage[best_agent.name] = self._pending_usage.get(best_agent.name, 0) + 1
+            if self._columns is not None and best_agent.name in self._columns.index:
+                self._columns.last_used[self._columns.index[best_agent.name]] = now
+            self._dirty = True
+            _unsaved_orchestrators.add(self)
             
             return {
                 'status': 'success',
-                'agent': best_agent.to_dict(),
-                'problem': asdict(problem),
+                'agent': best_agent,
+                'problem': problem,
                 'message': f"Routed to agent: {best_agent.name}"
             }
         else:
             # No suitable agent found - suggest creating one
             return {
                 'status': 'no_agent_found',
-                'problem': asdict(problem),
+                'problem': problem,
                 'suggestion': 'Consider creating a specialized agent for this problem',
                 'create_agent_command': f"python {self.meta_path}/agent_creator.py --domain='{problem.domain}' --description='{problem_description[:200]}'"
             }
     
     def register_agent(self, agent: Agent):
         """Register a new agent in the ecosystem"""
-        self.agents_registry[agent.name] = agent
+        self._add_to_registry(agent)
         self.save_agent_registry()
         logger.info(f"Registered new agent: {agent.name}")
     
+    def register_agents(self, agents: List[Agent]):
+        """Register several agents, saving the registry file once"""
+        for agent in agents:
+            self._add_to_registry(agent)
+        self.save_agent_registry()
+        logger.info(f"Registered {len(agents)} new agents")
+    
     def list_agents(self) -> List[Dict]:
         """List all registered agents"""
         return [agent.to_dict() for agent in self.agents_registry.values()]
@@ -244,30 +499,21 @@ class AgentOrchestrator:
     def get_ecosystem_status(self) -> Dict[str, Any]:
         """Get overall status of the agent ecosystem"""
         total_agents = len(self.agents_registry)
+        if sum(self._domain_counts.values()) != total_agents:
+            # The registry dict was changed directly rather than through register_agent
+            self._recount_ecosystem()
         
-        domains = {}
-        total_usage = 0
-        avg_performance = 0
-        
-        for agent in self.agents_registry.values():
-            # Domain distribution
-            if agent.domain not in domains:
-                domains[agent.domain] = 0
-            domains[agent.domain] += 1
-            
-            # Usage statistics
-            total_usage += agent.usage_count
-            avg_performance += agent.performance_score
-        
+        domains = dict(self._domain_counts)
+        avg_performance = self._perf_sum
         if total_agents > 0:
             avg_performance /= total_agents
         
         return {
             'total_agents': total_agents,
             'domains': domains,
-            'total_usage': total_usage,
+            'total_usage': self._total_usage,
             'average_performance': round(avg_performance, 2),
-            'most_active_domain': max(domains.items(), key=lambda x: x[1])[0] if domains else None
+            'most_active_domain': self._domain_counts.most_common(1)[0][0] if domains else None
         }
 
 def main():
@@ -289,7 +535,7 @@ def main():
             sys.exit(1)
         
         result = orchestrator.route_problem(args.problem)
-        print(json.dumps(result, indent=2))
+        print(json.dumps(result, indent=2, default=_json_default))
     
     elif args.command == 'list':
         agents = orchestrator.list_agents()
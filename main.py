@@ -15,18 +15,23 @@ Usage:
 import sys
 import json
 import argparse
+import importlib.util
 from pathlib import Path
 from datetime import datetime
+from functools import cached_property
 from typing import Dict, Any
 import logging
 
+try:
+    import orjson as _orjson
+except ImportError:  # command output falls back to the stdlib json module
+    _orjson = None
+
 # Add paths for imports
 sys.path.append(str(Path(__file__).parent / "90_meta_recursive"))
 sys.path.append(str(Path(__file__).parent / "20_templates"))
 
-from orchestrator import AgentOrchestrator
-from agent_creator import AgentCreator
-from mcp_integration import setup_mcp_integration
+from orchestrator import AgentOrchestrator, _json_default
 
 # Setup logging
 logging.basicConfig(
@@ -35,6 +40,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _jdump(obj: Any) -> str:
+    """Indented JSON text for command output"""
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2 | _orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2, default=_json_default)
+
 class ContextEngineeringCLI:
     """
     Main CLI interface for the context engineering framework
@@ -42,16 +53,29 @@ class ContextEngineeringCLI:
     
     def __init__(self):
         self.base_path = Path(__file__).parent
-        self.orchestrator = AgentOrchestrator(str(self.base_path))
-        self.agent_creator = AgentCreator(str(self.base_path))
-        
-        # Initialize MCP integration
+    
+    # Components are built on first use, so each command only pays for what it touches
+    
+    @cached_property
+    def orchestrator(self) -> AgentOrchestrator:
+        return AgentOrchestrator(str(self.base_path))
+    
+    @cached_property
+    def agent_creator(self):
+        from agent_creator import AgentCreator
+        return AgentCreator(str(self.base_path), orchestrator=self.orchestrator)
+    
+    @cached_property
+    def mcp(self):
+        """MCP integration, or None when it can't be set up"""
         try:
-            self.mcp = setup_mcp_integration()
+            from mcp_integration import setup_mcp_integration
+            mcp = setup_mcp_integration()
             logger.info("MCP integration initialized")
+            return mcp
         except Exception as e:
             logger.warning(f"MCP integration not available: {e}")
-            self.mcp = None
+            return None
     
     def solve_problem(self, problem_description: str) -> Dict[str, Any]:
         """
@@ -64,15 +88,15 @@ class ContextEngineeringCLI:
         
         if routing_result['status'] == 'success':
             # Problem routed successfully
-            agent_info = routing_result['agent']
+            agent = routing_result['agent']
             
             # TODO: Actually execute the agent
             # For now, return routing information
             return {
                 'status': 'routed',
-                'agent': agent_info['name'],
-                'domain': agent_info['domain'],
-                'message': f"Problem routed to {agent_info['name']}",
+                'agent': agent.name,
+                'domain': agent.domain,
+                'message': f"Problem routed to {agent.name}",
                 'routing_details': routing_result
             }
         
@@ -82,8 +106,8 @@ class ContextEngineeringCLI:
             
             # Ask if user wants to create a specialized agent
             print(f"\nNo suitable agent found for this problem.")
-            print(f"Detected domain: {problem_analysis.get('domain', 'unknown')}")
-            print(f"Complexity: {problem_analysis.get('complexity', 'unknown')}")
+            print(f"Detected domain: {problem_analysis.domain}")
+            print(f"Complexity: {problem_analysis.complexity}")
             print(f"\nWould you like me to create a specialized agent? (y/n): ", end="")
             
             response = input().lower().strip()
@@ -91,7 +115,7 @@ class ContextEngineeringCLI:
                 # Create new agent
                 creation_result = self.create_agent(
                     description=problem_description,
-                    domain=problem_analysis.get('domain')
+                    domain=problem_analysis.domain
                 )
                 
                 if creation_result['status'] == 'success':
@@ -142,11 +166,19 @@ class ContextEngineeringCLI:
         """
         ecosystem_status = self.orchestrator.get_ecosystem_status()
         
-        # Add MCP status
-        mcp_status = {
-            'available': self.mcp is not None,
-            'servers': self.mcp.available_servers if self.mcp else []
-        }
+        # Add MCP status; report an existing integration, otherwise only
+        # check that the module is importable rather than setting it up
+        if 'mcp' in self.__dict__:
+            mcp = self.mcp
+            mcp_status = {
+                'available': mcp is not None,
+                'servers': mcp.available_servers if mcp else []
+            }
+        else:
+            mcp_status = {
+                'available': importlib.util.find_spec('mcp_integration') is not None,
+                'servers': []
+            }
         
         return {
             'status': 'success',
@@ -184,7 +216,7 @@ class ContextEngineeringCLI:
                 
                 elif user_input.lower() == 'status':
                     status = self.get_system_status()
-                    print(json.dumps(status, indent=2))
+                    print(_jdump(status))
                 
                 elif user_input.lower() == 'list':
                     agents = self.list_agents()
@@ -197,7 +229,7 @@ class ContextEngineeringCLI:
                     if description:
                         result = self.create_agent(description)
                         print(f"\nAgent creation result:")
-                        print(json.dumps(result, indent=2))
+                        print(_jdump(result))
                     else:
                         print("Please provide a description: create <description>")
                 
@@ -205,7 +237,7 @@ class ContextEngineeringCLI:
                     # Treat as problem to solve
                     result = self.solve_problem(user_input)
                     print(f"\nResult:")
-                    print(json.dumps(result, indent=2))
+                    print(_jdump(result))
             
             except KeyboardInterrupt:
                 print("\n\nExiting...")
@@ -274,19 +306,19 @@ Examples:
     
     if args.command == 'solve':
         result = cli.solve_problem(args.problem)
-        print(json.dumps(result, indent=2))
+        print(_jdump(result))
     
     elif args.command == 'create-agent':
         result = cli.create_agent(args.description, args.domain)
-        print(json.dumps(result, indent=2))
+        print(_jdump(result))
     
     elif args.command == 'list-agents':
         result = cli.list_agents()
-        print(json.dumps(result, indent=2))
+        print(_jdump(result))
     
     elif args.command == 'system-status':
         result = cli.get_system_status()
-        print(json.dumps(result, indent=2))
+        print(_jdump(result))
     
     elif args.command == 'interactive':
         cli.interactive_mode()